@@ -0,0 +1,561 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from sudoku_core import grader, profiling, symmetry
+from sudoku_core.generator import LEVEL_REMOVED, SudokuGenerator, generate_many
+from sudoku_core.pencil_marks import PencilMarks
+
+"""
+Rough timing script for puzzle generation and drawing
+Run it with: python3 benchmark.py
+Save the results to compare against another commit with: python3 benchmark.py --json results.json
+Compare two saved runs with: python3 benchmark.py compare old.json new.json
+Run only the import time check with: python3 benchmark.py startup (exits with 1 if it fails)
+
+"""
+
+LEVEL_NAMES = {grader.EASY: "easy", grader.MEDIUM: "medium", grader.HARD: "hard"}
+
+
+class ScanSudokuGenerator(SudokuGenerator):
+    '''
+    The old generator - checks that rescan the board lists on every call, the guess-and-check
+    fill_box and the fixed-order fill_remaining search
+    Kept here only so the benchmark has something to compare the current generator against
+    '''
+
+    def fill_solution(self, max_backtracks=None):
+        self.clear_board()
+        self.fill_diagonal()
+        self.fill_remaining(0, 0)
+
+    def fill_box(self, row_start, col_start):
+        for row in range(row_start, row_start + self.box_length):
+            for col in range(col_start, col_start + self.box_length):
+                while True:  # draw digits until one isn't in the box yet
+                    term = self.rng.randrange(1, self.row_length + 1)
+                    if self.is_valid(row, col, term):
+                        self.place(row, col, term)
+                        break
+
+    def valid_in_row(self, row, num):
+        return num not in self.board[row]
+
+    def valid_in_col(self, col, num):
+        for i in range(self.row_length):
+            if self.board[i][col] == num:
+                return False
+        return True
+
+    def valid_in_box(self, row_start, col_start, num):
+        for row in range(row_start, row_start + self.box_length):
+            for col in range(col_start, col_start + self.box_length):
+                if self.board[row][col] == num:
+                    return False
+        return True
+
+    def is_valid(self, row, col, num):
+        box_row = self.box_length * (row // self.box_length)
+        box_col = self.box_length * (col // self.box_length)
+        return (self.valid_in_col(col, num) and self.valid_in_row(row, num)
+                and self.valid_in_box(box_row, box_col, num))
+
+
+'''
+Builds puzzles for a fixed amount of time and reports how many were made per second
+
+Parameters:
+generator_class is the class to construct (SudokuGenerator or a subclass)
+removed is the number of cells to clear in each puzzle
+seconds is roughly how long to keep generating
+
+Return: float (puzzles per second)
+'''
+
+
+def puzzles_per_second(generator_class, removed, seconds=2.0):
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        generator_class(9, removed)
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+'''
+Builds unique-solution puzzles aiming for a clue count and reports how fast they come out
+Greedy removal usually bottoms out somewhere in the low-to-mid 20s, so puzzles that can't reach
+the target are still counted but reported separately
+
+Parameters:
+clues is the number of clues to aim for
+seconds is roughly how long to keep generating
+
+Return: tuple (puzzles per second, fraction that reached the target, fewest clues seen)
+'''
+
+
+def unique_puzzles_per_second(clues, seconds=2.0):
+    count = 0
+    reached = 0
+    fewest = 81
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        sudoku = SudokuGenerator(9, 81 - clues, unique=True)
+        given = len(sudoku.given_cells)
+        reached += given <= clues
+        fewest = min(fewest, given)
+        count += 1
+    return count / (time.perf_counter() - start), reached / count, fewest
+
+
+'''
+Makes puzzles from a single unique puzzle with random symmetry transforms instead of generating them
+
+Parameters:
+seconds is roughly how long to keep deriving
+
+Return: float (puzzles per second)
+'''
+
+
+def derived_puzzles_per_second(seconds=2.0):
+    sudoku = SudokuGenerator(9, 81, unique=True)
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for derived in symmetry.derive(sudoku, 100):
+            pass
+        count += 100
+    return count / (time.perf_counter() - start)
+
+
+'''
+Times generate_many with a growing number of worker processes to check how it scales
+
+Parameters:
+n is the number of puzzles to make for each worker count
+removed is the number of cells to clear in each puzzle
+
+Return: list of (workers, puzzles per second) tuples
+'''
+
+
+def batch_scaling(n=2000, removed=40):
+    results = []
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        for chunk in generate_many(n, removed, workers=workers, seed=0):
+            pass
+        results.append((workers, n / (time.perf_counter() - start)))
+        workers *= 2
+    return results
+
+
+'''
+Times building complete solutions for each board size
+
+Parameters:
+sizes is the board sizes to time
+seconds is roughly how long to spend on each size
+
+Return: list of (size, boards, median seconds, slowest seconds) tuples
+'''
+
+
+def generation_time_by_size(sizes=(9, 16, 25), seconds=5.0):
+    results = []
+    for size in sizes:
+        times = []
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds or not times:
+            board_start = time.perf_counter()
+            SudokuGenerator(size, 0)
+            times.append(time.perf_counter() - board_start)
+        times.sort()
+        results.append((size, len(times), times[len(times) // 2], times[-1]))
+    return results
+
+
+'''
+Grades a fixed set of unique puzzles over and over and reports the rate
+
+Parameters:
+removed is the number of cells to try removing from each puzzle
+puzzles is how many different puzzles to grade
+seconds is roughly how long to keep grading
+
+Return: float (grades per second)
+'''
+
+
+def grades_per_second(removed=81, puzzles=100, seconds=2.0):
+    boards = [SudokuGenerator(9, removed, unique=True).board for i in range(puzzles)]
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for board in boards:
+            grader.grade(board)
+        count += len(boards)
+    return count / (time.perf_counter() - start)
+
+
+'''
+Validates a stack of boards with the NumPy batch functions and reports the rate
+Needs NumPy (sudoku_core.batch is the only part that uses it)
+
+Parameters:
+boards is how many boards to check at once
+seconds is roughly how long to keep checking
+
+Return: float (boards per second)
+'''
+
+
+def batch_validated_per_second(boards=100000, seconds=2.0):
+    from sudoku_core import batch
+
+    stack = batch.as_boards([SudokuGenerator(9, 0).board for i in range(100)] * (boards // 100))
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        batch.validate(stack)
+        count += len(stack)
+    return count / (time.perf_counter() - start)
+
+
+'''
+Times SudokuGenerator construction for one difficulty the way the game builds its puzzles, then
+builds the same number again with the profiling hooks on to see where the time goes
+The timed pass runs without the hooks, so their overhead doesn't end up in the rate
+
+Parameters:
+level is grader.EASY, MEDIUM or HARD
+count is how many puzzles to build for each pass
+
+Return: dict (rate, median, backtracks and restarts per board, and the profile of the hooked pass)
+'''
+
+
+def construction_profile(level, count=20):
+    times = []
+    for i in range(count):
+        start = time.perf_counter()
+        SudokuGenerator(9, LEVEL_REMOVED[level], unique=True, seed=i)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    backtracks = restarts = 0
+    with profiling.profiled():
+        for i in range(count):
+            sudoku = SudokuGenerator(9, LEVEL_REMOVED[level], unique=True, seed=i)
+            backtracks += sudoku.backtracks
+            restarts += sudoku.restarts
+        profile = {name.split(":")[1]: {"calls": calls, "seconds": seconds}
+                   for name, calls, seconds in profiling.report()}
+    return {"puzzles_per_second": count / sum(times), "median_ms": times[len(times) // 2] * 1000,
+            "backtracks_per_board": backtracks / count, "restarts_per_board": restarts / count,
+            "profile": profile}
+
+
+'''
+Counts the dead ends the original fill_values / fill_remaining search hits on the way to a full
+board - every unplace() it makes is one backtrack
+The diagonal boxes are filled before the hooks go on, since fill_box calls unplace() on every cell
+it fills and those aren't backtracks
+
+Parameters:
+boards is how many solutions to build
+
+Return: tuple (backtracks per board, is_valid calls per board, milliseconds per board with the hooks on)
+'''
+
+
+def fill_remaining_backtracks(boards=20):
+    hooks = ["sudoku_core.generator:SudokuGenerator.unplace", "sudoku_core.generator:SudokuGenerator.is_valid"]
+    sudoku = SudokuGenerator(9, 0)
+    elapsed = 0.0
+    backtracks = 0
+    checks = 0
+    for i in range(boards):
+        sudoku.clear_board()
+        sudoku.fill_diagonal()
+        with profiling.profiled(hooks):
+            start = time.perf_counter()
+            sudoku.fill_remaining(0, sudoku.box_length)
+            elapsed += time.perf_counter() - start
+            calls = {name: calls for name, calls, seconds in profiling.report()}
+        backtracks += calls.get(hooks[0], 0)
+        checks += calls.get(hooks[1], 0)
+    return backtracks / boards, checks / boards, elapsed / boards * 1000
+
+
+'''
+Times remove_cells on its own, starting from a full solution each time
+
+Parameters:
+removed is the number of cells to try removing
+unique is True to only remove cells that keep the solution unique
+count is how many boards to time
+
+Return: float (median milliseconds per call)
+'''
+
+
+def remove_cells_time(removed, unique, count=50):
+    times = []
+    for i in range(count):
+        sudoku = SudokuGenerator(9, 0, seed=i)
+        sudoku.removed_cells = removed
+        sudoku.unique = unique
+        start = time.perf_counter()
+        sudoku.remove_cells()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2] * 1000
+
+
+def is_valid_per_second(seconds=1.0):
+    sudoku = SudokuGenerator(9, 40)
+    checks = [(row, col, num) for row in range(9) for col in range(9) for num in range(1, 10)]
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for row, col, num in checks:
+            sudoku.is_valid(row, col, num)
+        count += len(checks)
+    return count / (time.perf_counter() - start)
+
+
+'''
+Times draw_numbers and the BoardRenderer onto an off-screen surface, with SDL's dummy video driver
+so no window is opened
+Needs pygame (sudoku_ui is the only module that uses it)
+
+Parameters:
+frames is how many frames to draw for each measurement
+
+Return: dict (milliseconds per frame for draw_numbers, a full BoardRenderer redraw, and a redraw
+after one cell changed)
+'''
+
+
+def draw_times(frames=200):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    import sudoku_ui
+
+    pygame.init()
+    screen = pygame.Surface((sudoku_ui.CELL_SIZE * 9, sudoku_ui.CELL_SIZE * 9))
+    sudoku = SudokuGenerator(9, LEVEL_REMOVED[grader.MEDIUM])
+    board = [board_row[:] for board_row in sudoku.board]
+    sketched_values = PencilMarks()
+    for row, col in [(row, col) for row in range(9) for col in range(9) if board[row][col] == 0][::2]:
+        sketched_values.toggle(row, col, sudoku.board_correct[row][col])
+    renderer = sudoku_ui.BoardRenderer(screen)
+
+    start = time.perf_counter()
+    for i in range(frames):
+        sudoku_ui.draw_numbers(screen, board, [4, 4], sudoku, sketched_values)
+    numbers = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(frames):
+        renderer.invalidate()
+        renderer.draw(board, [4, 4], sudoku, sketched_values)
+    full = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(frames):
+        renderer.draw(board, [i % 9, 4], sudoku, sketched_values)  # the selection moves every frame
+    changed = time.perf_counter() - start
+    pygame.quit()
+    return {"draw_numbers_ms": numbers / frames * 1000, "full_redraw_ms": full / frames * 1000,
+            "one_cell_redraw_ms": changed / frames * 1000}
+
+
+def commit_hash():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+'''
+Prints the hot-path benchmarks and returns them flattened into name -> number, ready to save
+
+Parameters: None
+Return: dict
+'''
+
+
+def hot_paths():
+    metrics = {}
+    for level, name in LEVEL_NAMES.items():
+        result = construction_profile(level)
+        print(f"construct {name:<7} {result['puzzles_per_second']:8.1f} puzzles/s   median {result['median_ms']:7.2f} ms"
+              f"   backtracks/board {result['backtracks_per_board']:6.1f}   restarts/board {result['restarts_per_board']:4.2f}")
+        for key in ("puzzles_per_second", "median_ms", "backtracks_per_board", "restarts_per_board"):
+            metrics[f"construct.{name}.{key}"] = result[key]
+        for function, stats in result["profile"].items():
+            metrics[f"construct.{name}.calls.{function}"] = stats["calls"]
+
+    backtracks, checks, milliseconds = fill_remaining_backtracks()
+    print(f"fill_remaining  {backtracks:8.1f} backtracks/board   {checks:8.1f} is_valid calls/board   {milliseconds:7.2f} ms/board")
+    metrics.update({"fill_remaining.backtracks_per_board": backtracks, "fill_remaining.is_valid_per_board": checks,
+                    "fill_remaining.ms_per_board": milliseconds})
+
+    for removed, unique in ((30, False), (55, False), (81, True)):
+        key = f"remove_cells.{removed}{'.unique' if unique else ''}.median_ms"
+        metrics[key] = remove_cells_time(removed, unique)
+        print(f"remove_cells {removed} {'unique' if unique else 'any':<6} {metrics[key]:8.3f} ms")
+
+    metrics["is_valid.calls_per_second"] = is_valid_per_second()
+    print(f"is_valid {metrics['is_valid.calls_per_second']:12.0f} calls/s")
+
+    try:
+        for key, milliseconds in draw_times().items():
+            metrics[f"draw.{key}"] = milliseconds
+            print(f"{key:<20} {milliseconds:8.3f} ms")
+    except ImportError:
+        print("draw_numbers: skipped (needs pygame)")
+    return metrics
+
+
+'''
+Prints every metric two saved runs have in common, with the change from the old run to the new one
+Whether a change is good depends on the metric - rates should go up, times and counts down
+
+Parameters:
+old_path and new_path are files written by python3 benchmark.py --json
+
+Return: None
+'''
+
+
+def compare(old_path, new_path):
+    with open(old_path) as file:
+        old = json.load(file)
+    with open(new_path) as file:
+        new = json.load(file)
+    print(f"{old['commit']} ({old['time']}) -> {new['commit']} ({new['time']})")
+    for name, before in old["metrics"].items():
+        after = new["metrics"].get(name)
+        if after is None:
+            continue
+        change = f"{(after - before) / before:+8.1%}" if before else "       -"
+        print(f"{name:<60} {before:14.3f} {after:14.3f} {change}")
+
+
+IMPORT_BUDGET = 0.05  # most seconds importing the headless modules may take
+HEADLESS_MODULES = ("sudoku_core", "sudoku_generator")
+
+
+'''
+Times importing a module in a fresh interpreter, so nothing is already cached in sys.modules
+
+Parameters:
+module is the module name to import
+runs is how many interpreters to start (the median is reported)
+
+Return: tuple (median seconds, whether pygame got imported along with it)
+'''
+
+
+def import_time(module, runs=5):
+    code = ("import sys, time; start = time.perf_counter(); import " + module +
+            "; print(time.perf_counter() - start, 'pygame' in sys.modules)")
+    times = []
+    for i in range(runs):
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.split()
+        times.append(float(output[0]))
+        loaded_pygame = output[1] == "True"
+    times.sort()
+    return times[len(times) // 2], loaded_pygame
+
+
+'''
+Prints the import time of every headless module and checks it against IMPORT_BUDGET
+
+Parameters: None
+Return: boolean (True if every module is under budget and none of them imported pygame)
+'''
+
+
+def check_startup():
+    passed = True
+    for module in HEADLESS_MODULES:
+        seconds, loaded_pygame = import_time(module)
+        ok = seconds <= IMPORT_BUDGET and not loaded_pygame
+        passed = passed and ok
+        print(f"import {module:<16} {seconds * 1000:6.1f} ms   pygame loaded: {loaded_pygame!s:<5}   "
+              f"{'ok' if ok else 'FAILED'} (budget {IMPORT_BUDGET * 1000:.0f} ms)")
+    return passed
+
+
+def main(json_path=None):
+    check_startup()
+
+    print()
+    metrics = hot_paths()
+
+    print()
+    for label, removed in (("easy", 30), ("medium", 40), ("hard", 50)):
+        before = puzzles_per_second(ScanSudokuGenerator, removed)
+        after = puzzles_per_second(SudokuGenerator, removed)
+        metrics[f"puzzles_per_second.{label}"] = after
+        print(f"{label:<8} old: {before:8.1f} puzzles/s   new: {after:8.1f} puzzles/s   ({after / before:.2f}x)")
+
+    print()
+    for size, boards, median, slowest in generation_time_by_size():
+        metrics[f"solution.{size}x{size}.median_ms"] = median * 1000
+        print(f"{size}x{size}: {boards:6d} boards   median {median * 1000:8.1f} ms   slowest {slowest * 1000:8.1f} ms")
+
+    print()
+    for clues in (30, 27, 24, 21, 17):
+        rate, reached, fewest = unique_puzzles_per_second(clues)
+        metrics[f"unique.{clues}.puzzles_per_second"] = rate
+        print(f"unique {clues} clues: {rate:8.1f} puzzles/s   reached target: {reached:6.1%}   fewest clues: {fewest}")
+    metrics["derived.puzzles_per_second"] = derived_puzzles_per_second()
+    print(f"derived by symmetry: {metrics['derived.puzzles_per_second']:8.1f} puzzles/s")
+
+    print()
+    results = batch_scaling()
+    single = results[0][1]
+    for workers, rate in results:
+        metrics[f"generate_many.{workers}.puzzles_per_second"] = rate
+        print(f"generate_many {workers:>3} workers: {rate:8.1f} puzzles/s   ({rate / single:.2f}x)")
+
+    print()
+    for removed in (30, 55, 81):
+        metrics[f"grade.{removed}.per_second"] = grades_per_second(removed)
+        print(f"grading {removed} removed: {metrics[f'grade.{removed}.per_second']:8.1f} grades/s")
+
+    print()
+    try:
+        metrics["batch_validate.per_second"] = batch_validated_per_second()
+        print(f"batch validate: {metrics['batch_validate.per_second']:10.1f} boards/s")
+    except ImportError:
+        print("batch validate: skipped (needs numpy)")
+
+    if json_path is not None:
+        results = {"commit": commit_hash(), "python": platform.python_version(),
+                   "time": time.strftime("%Y-%m-%d %H:%M:%S"), "metrics": metrics}
+        with open(json_path, "w") as file:
+            json.dump(results, file, indent=1, sort_keys=True)
+        print(f"\nresults saved to {json_path}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["startup"]:
+        sys.exit(0 if check_startup() else 1)
+    if len(sys.argv) == 4 and sys.argv[1] == "compare":
+        compare(sys.argv[2], sys.argv[3])
+        sys.exit()
+    main(sys.argv[2] if len(sys.argv) == 3 and sys.argv[1] == "--json" else None)
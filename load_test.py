@@ -0,0 +1,108 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from puzzle_client import PuzzleClient
+from sudoku_core.generator import SudokuGenerator
+
+"""
+Load test for the local puzzle service - starts a server, runs many client threads against it
+and reports latency percentiles and throughput for each kind of request
+Run it with: python3 load_test.py [clients] [requests per client]
+
+"""
+
+SOCKET = "/tmp/sudoku-load-test.sock"
+OPS = ("generate", "solve", "grade", "validate")
+
+
+'''
+Starts puzzle_server.py in its own process and waits until it is accepting connections
+
+Parameters:
+path is the Unix socket for it to listen on
+
+Return: subprocess.Popen
+'''
+
+
+def start_server(path):
+    server = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                           "puzzle_server.py"), path],
+                              stdout=subprocess.PIPE, text=True)
+    server.stdout.readline()  # "serving puzzles on ..." once the socket is listening
+    return server
+
+
+def percentile(times, fraction):
+    return times[min(len(times) - 1, int(len(times) * fraction))]
+
+
+'''
+Sends requests from one client thread, cycling through every kind, and records how long each took
+
+Parameters:
+client is the shared PuzzleClient
+boards is a list of puzzles to solve, grade and validate
+count is how many requests to send
+latencies is the dict of op -> list of seconds to add to
+
+Return: None
+'''
+
+
+def run_client(client, boards, count, latencies):
+    for i in range(count):
+        op = OPS[i % len(OPS)]
+        board = boards[i % len(boards)]
+        start = time.perf_counter()
+        if op == "generate":
+            client.generate(i % 3)
+        elif op == "solve":
+            client.solve(board)
+        elif op == "grade":
+            client.grade(board)
+        else:
+            client.validate(board)
+        latencies[op].append(time.perf_counter() - start)  # list.append is atomic, so no lock needed
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    boards = [SudokuGenerator(9, 50).board for i in range(50)]
+
+    server = start_server(SOCKET)
+    try:
+        with PuzzleClient(SOCKET, max_connections=clients) as client:
+            client.generate(0)  # open one connection and make sure the server answers before timing
+            latencies = {op: [] for op in OPS}
+            threads = [threading.Thread(target=run_client, args=(client, boards, per_client, latencies))
+                       for i in range(clients)]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+            stats = client.stats()
+    finally:
+        server.terminate()
+        server.wait()
+
+    total = sum(len(times) for times in latencies.values())
+    print(f"{clients} clients x {per_client} requests: {total / elapsed:8.1f} requests/s")
+    for op in OPS:
+        times = sorted(latencies[op])
+        if times:
+            print(f"{op:<9} {len(times):6d} requests   p50 {percentile(times, 0.5) * 1000:7.2f} ms   "
+                  f"p99 {percentile(times, 0.99) * 1000:7.2f} ms")
+    for op, counts in stats["batches"].items():
+        if counts["batches"]:
+            print(f"{op:<9} {counts['items'] / counts['batches']:6.1f} requests per batch")
+
+
+if __name__ == "__main__":
+    main()
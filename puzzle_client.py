@@ -0,0 +1,124 @@
+import json
+import queue
+import socket
+import threading
+
+from sudoku_core.board import Board
+from sudoku_core.generator import SudokuGenerator
+
+"""
+Client for the local puzzle service (puzzle_server.py)
+Connections are kept open and reused, and up to max_connections requests can be in flight at
+once from different threads
+
+"""
+
+SOCKET_PATH = "/tmp/sudoku-puzzles.sock"  # where puzzle_server.py listens unless told otherwise
+
+
+class PuzzleClient:
+    '''
+    Sets up an empty connection pool - connections are only opened when they are first needed
+
+    Parameters:
+    path is the server's Unix socket
+    max_connections is the most connections open at once (more threads than this wait their turn)
+    timeout is the most seconds to wait for a response
+
+    Return:
+    None
+    '''
+
+    def __init__(self, path=SOCKET_PATH, max_connections=4, timeout=30.0):
+        self.path = path
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()  # open connections nobody is using, most recently used first
+        self.slots = threading.BoundedSemaphore(max_connections)
+        self.lock = threading.Lock()
+        self.next_id = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.path)
+        return sock, sock.makefile("rwb")
+
+    '''
+    Sends one request and waits for its response
+
+    Parameters:
+    op is the request kind ("generate", "solve", "grade", "validate" or "stats")
+    fields are the rest of the request
+
+    Return: dict (the response)
+    '''
+
+    def request(self, op, **fields):
+        with self.lock:
+            self.next_id += 1
+            fields["id"] = self.next_id
+        fields["op"] = op
+        with self.slots:
+            try:
+                connection = self.idle.get_nowait()
+            except queue.Empty:
+                connection = self._connect()
+            sock, file = connection
+            try:
+                file.write(json.dumps(fields, separators=(",", ":")).encode() + b"\n")
+                file.flush()
+                line = file.readline()
+                if not line:
+                    raise ConnectionError("the puzzle server closed the connection")
+            except BaseException:
+                file.close()
+                sock.close()
+                raise
+            self.idle.put(connection)
+        response = json.loads(line)
+        if not response["ok"]:
+            raise ValueError(response["error"])
+        return response
+
+    '''
+    Gets a puzzle from the server's ready pool, or the seeded puzzle for a seed
+
+    Parameters:
+    difficulty is grader.EASY, MEDIUM or HARD
+    seed is the seed to generate from (None for any ready puzzle)
+
+    Return: SudokuGenerator
+    '''
+
+    def generate(self, difficulty, seed=None):
+        response = self.request("generate", difficulty=difficulty, seed=seed)
+        return SudokuGenerator.from_boards(Board.from_string(response["board"]).to_lists(),
+                                           Board.from_string(response["solution"]).to_lists())
+
+    def solve(self, board):
+        solution = self.request("solve", board=Board.from_lists(board).to_string())["solution"]
+        return Board.from_string(solution).to_lists() if solution is not None else None
+
+    def grade(self, board):
+        return self.request("grade", board=Board.from_lists(board).to_string())
+
+    def validate(self, board):
+        return self.request("validate", board=Board.from_lists(board).to_string())
+
+    def stats(self):
+        return self.request("stats")
+
+    def close(self):
+        while True:
+            try:
+                sock, file = self.idle.get_nowait()
+            except queue.Empty:
+                return
+            file.close()
+            sock.close()
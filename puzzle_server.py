@@ -0,0 +1,362 @@
+import asyncio
+import json
+import os
+import signal
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from puzzle_client import SOCKET_PATH
+from sudoku_core import grader, solver, symmetry
+from sudoku_core.board import Board
+from sudoku_core.board_model import BoardModel
+from sudoku_core.generator import new_sudoku
+from sudoku_core.puzzle_cache import PuzzleCache
+from sudoku_core.puzzle_pool import PuzzlePool
+
+try:
+    from sudoku_core import batch
+except ImportError:  # no NumPy, so batches are solved and validated one board at a time
+    batch = None
+
+"""
+Local puzzle service - one process that generates, solves, grades and validates puzzles for
+every front end on the machine, over a Unix domain socket
+Run it with: python3 puzzle_server.py [socket path]
+
+Protocol: one JSON object per line each way. Boards are strings with one character per cell
+(see Board.to_string). Every request has an "op" and may have an "id", which is copied into the
+response so a client can send several requests before reading the answers
+    {"op": "generate", "difficulty": 0, "seed": 123}  -> {"board": ..., "solution": ...}
+    {"op": "solve", "board": ...}                     -> {"solution": ... or null}
+    {"op": "grade", "board": ...}                     -> {"level", "score", "hardest", "solved"}
+    {"op": "validate", "board": ...}                  -> {"valid", "complete", "conflicts": [cell indexes]}
+    {"op": "stats"}                                   -> request counts and puzzle cache stats
+Responses have "ok": true, or "ok": false and an "error" message
+
+Requests that arrive close together are handled as one batch on a worker thread, so the event
+loop never blocks and the per-request overhead is paid once per batch. Generation has its own
+worker, so a slow seeded puzzle never holds up solving or grading. When more puzzles are asked for
+than the pool has ready, the extra ones are symmetry transforms of the last pool puzzle for that
+level - new-looking puzzles of the same grade, without waiting for generation
+
+"""
+
+POOL_DEPTH = 8  # ready puzzles kept for each difficulty
+MAX_BATCH = 64  # most requests handled together
+BATCH_DELAY = 0.002  # seconds to wait for more requests before handling a batch
+LEVELS = (grader.EASY, grader.MEDIUM, grader.HARD)
+
+
+class Batcher:
+    '''
+    Collects requests of one kind and hands them to a handler in batches
+
+    Parameters:
+    handler is called as handler(items) on the worker thread and returns one result per item - an
+    exception in place of a result fails only that item's request
+    executor is where handler runs
+    max_batch is the most items per batch
+    delay is how long the first item in a batch waits for others to join it
+
+    Return:
+    None
+    '''
+
+    def __init__(self, handler, executor, max_batch=MAX_BATCH, delay=BATCH_DELAY):
+        self.handler = handler
+        self.executor = executor
+        self.max_batch = max_batch
+        self.delay = delay
+        self.waiting = []  # (item, future) pairs for the next batch
+        self.timer = None
+        self.batches = 0
+        self.items = 0
+
+    '''
+    Adds an item to the next batch and waits for its result
+
+    Parameters:
+    item is the handler's input for this request
+
+    Return: the handler's result for the item (its exception is raised here if it failed)
+    '''
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.waiting.append((item, future))
+        if len(self.waiting) >= self.max_batch:
+            self.flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.delay, self.flush)
+        return await future
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        waiting, self.waiting = self.waiting, []
+        if waiting:
+            asyncio.ensure_future(self.run(waiting))
+
+    async def run(self, waiting):
+        self.batches += 1
+        self.items += len(waiting)
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.handler, [item for item, future in waiting])
+        except Exception as error:  # the handler itself broke, so there is nothing to tell the items apart
+            for item, future in waiting:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (item, future), result in zip(waiting, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+'''
+Runs a function on every item of a batch, catching errors one item at a time
+
+Parameters:
+function is called as function(item)
+items is the batch
+
+Return: list of results, with the exception in place of the result for items that failed
+'''
+
+
+def _each(function, items):
+    results = []
+    for item in items:
+        try:
+            results.append(function(item))
+        except Exception as error:
+            results.append(error)
+    return results
+
+
+def _board_arg(request):
+    board = request.get("board")
+    if not isinstance(board, str):
+        raise ValueError("missing board")
+    return Board.from_string(board)
+
+
+'''
+Solves a batch of boards - all at once with NumPy when it is installed
+
+Parameters:
+boards is a list of Board
+
+Return: list of solution strings (None for boards with no solution), or the exception for a
+board that couldn't be solved
+'''
+
+
+def solve_batch(boards):
+    if batch is not None and len({board.size for board in boards}) == 1:
+        try:
+            solved_boards, solved = batch.solve_boards([board.to_lists() for board in boards])
+            return [Board.from_lists(solution.tolist()).to_string() if ok else None
+                    for solution, ok in zip(solved_boards, solved)]
+        except Exception:
+            pass  # one of the boards broke the batch, so solve them one at a time to find it
+    return _each(solve_one, boards)
+
+
+def solve_one(board):
+    solution = solver.solve(board.to_lists())
+    return Board.from_lists(solution).to_string() if solution is not None else None
+
+
+def grade_batch(boards):
+    return _each(grade_one, boards)
+
+
+def grade_one(board):
+    result = grader.grade(board.to_lists())
+    return {"level": result.level, "score": result.score, "hardest": result.hardest, "solved": result.solved}
+
+
+def validate_batch(boards):
+    if batch is not None and len({board.size for board in boards}) == 1:
+        try:
+            report = batch.validate([board.to_lists() for board in boards])
+            return [{"valid": bool(valid), "complete": bool(complete),
+                     "conflicts": conflicts.ravel().nonzero()[0].tolist()}
+                    for valid, complete, conflicts in zip(report.valid, report.complete, report.conflicts)]
+        except Exception:
+            pass  # one of the boards broke the batch, so check them one at a time to find it
+    return _each(validate_one, boards)
+
+
+def validate_one(board):
+    cells = board.to_lists()
+    model = BoardModel(cells, cells)
+    conflicts = [row * board.size + col for row in range(board.size) for col in range(board.size)
+                 if model.is_conflict(row, col)]
+    return {"valid": not conflicts, "complete": not conflicts and model.is_full(), "conflicts": conflicts}
+
+
+class PuzzleServer:
+    '''
+    Sets up the warm puzzle pool, the seeded puzzle cache and a batcher for each request kind
+
+    Parameters:
+    path is the Unix socket to listen on
+    depth is how many ready puzzles to keep for each difficulty
+
+    Return:
+    None
+    '''
+
+    def __init__(self, path=SOCKET_PATH, depth=POOL_DEPTH):
+        self.path = path
+        self.pool = PuzzlePool(new_sudoku, LEVELS, depth=depth)
+        self.cache = PuzzleCache()
+        # one worker thread each is enough - the GIL stops more threads running Python in
+        # parallel, and batching already pays the hand-off to the thread once per batch
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="puzzle-worker")
+        self.generate_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="puzzle-generate")
+        self.bases = {}  # level -> last puzzle taken from the pool, to transform when it runs dry
+        self.batchers = {"generate": Batcher(self.generate_batch, self.generate_executor),
+                         "solve": Batcher(solve_batch, self.executor),
+                         "grade": Batcher(grade_batch, self.executor),
+                         "validate": Batcher(validate_batch, self.executor)}
+        self.requests = 0
+        self.errors = 0
+        self.server = None
+
+    def generate_batch(self, requests):
+        return _each(self.generate_one, requests)
+
+    def generate_one(self, request):
+        difficulty, seed = request
+        if seed is not None:
+            sudoku = self.cache.get(9, difficulty, seed)
+        else:
+            sudoku = self.pool.get_nowait(difficulty)
+            if sudoku is not None:
+                self.bases[difficulty] = sudoku
+            elif difficulty in self.bases:
+                sudoku = symmetry.random_transform().apply_sudoku(self.bases[difficulty])
+            else:
+                sudoku = self.bases[difficulty] = self.pool.get(difficulty)
+        return {"board": Board.from_lists(sudoku.board_original).to_string(),
+                "solution": Board.from_lists(sudoku.board_correct).to_string()}
+
+    '''
+    Works out the answer to one request
+
+    Parameters:
+    request is the decoded JSON object
+
+    Return: dict (the response without "ok" and "id")
+    '''
+
+    async def dispatch(self, request):
+        op = request.get("op")
+        if op == "generate":
+            difficulty = request.get("difficulty", grader.EASY)
+            seed = request.get("seed")
+            # type() rather than isinstance(), since true/false are ints too (and 1.0 == 1 is in LEVELS)
+            if type(difficulty) is not int or difficulty not in LEVELS or not (seed is None or type(seed) is int):
+                raise ValueError("difficulty must be 0, 1 or 2 and seed an integer")
+            return await self.batchers["generate"].submit((difficulty, seed))
+        if op == "solve":
+            return {"solution": await self.batchers["solve"].submit(_board_arg(request))}
+        if op in ("grade", "validate"):
+            return await self.batchers[op].submit(_board_arg(request))
+        if op == "stats":
+            return {"requests": self.requests, "errors": self.errors, "cache": self.cache.stats(),
+                    "batches": {name: {"batches": batcher.batches, "items": batcher.items}
+                                for name, batcher in self.batchers.items()}}
+        raise ValueError(f"unknown op {op!r}")
+
+    async def respond(self, line, writer):
+        self.requests += 1
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("requests must be JSON objects")
+            request_id = request.get("id")
+            response = await self.dispatch(request)
+            response["ok"] = True
+        except Exception as error:
+            self.errors += 1
+            response = {"ok": False, "error": str(error)}
+        if request_id is not None:
+            response["id"] = request_id
+        if not writer.is_closing():
+            writer.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+
+    '''
+    Serves one client connection - every request line is answered by its own task, so one slow
+    request doesn't hold up the others on the same connection
+
+    Parameters:
+    reader and writer are the connection's asyncio streams
+
+    Return: None
+    '''
+
+    async def handle(self, reader, writer):
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.ensure_future(self.respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                await writer.drain()
+            if tasks:
+                await asyncio.gather(*tasks)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, ready=None):
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # left over from a server that didn't shut down cleanly
+        self.server = await asyncio.start_unix_server(self.handle, path=self.path)
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, self.server.close)
+        if ready is not None:
+            ready()
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        except asyncio.CancelledError:
+            pass  # SIGTERM closed the server
+        finally:
+            self.close()
+
+    def close(self):
+        self.pool.close()
+        self.executor.shutdown(wait=False)
+        self.generate_executor.shutdown(wait=False)
+        self.cache.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else SOCKET_PATH
+    server = PuzzleServer(path)
+    try:
+        asyncio.run(server.serve(lambda: print(f"serving puzzles on {path}", flush=True)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
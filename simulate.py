@@ -0,0 +1,184 @@
+import json
+import platform
+import random
+import sys
+import time
+
+from benchmark import commit_hash
+from sudoku_core.game_logic import (COMMIT, ERASE, HINT, MOVE, NEXT_EMPTY, PLAYING, SELECT, SKETCH, UNDO, WON,
+                                    GameLogic)
+from sudoku_core.generator import SudokuGenerator
+
+"""
+Plays games without a window - scripted bots solve puzzles through GameLogic, every event they
+send is recorded, and the recorded traces are replayed as fast as possible to time each kind of event
+Run it with: python3 simulate.py [games]
+Save the results to compare against another commit with: python3 simulate.py [games] --json results.json
+(python3 benchmark.py compare old.json new.json reads them)
+
+"""
+
+REMOVED = 55  # cells taken out of each puzzle - a medium game
+DIRECTIONS = ("up", "down", "left", "right")
+
+
+'''
+Clicks the empty cells in a random order and types the right digit into each
+
+Parameters:
+logic is the GameLogic to play
+rng is the random.Random to draw from
+
+Return: generator of events
+'''
+
+
+def click_bot(logic, rng):
+    cells = [(row, col) for row in range(9) for col in range(9) if logic.board[row][col] == 0]
+    rng.shuffle(cells)
+    for row, col in cells:
+        yield SELECT, [row, col]
+        yield SKETCH, logic.sudoku.board_correct[row][col]
+        yield COMMIT, None
+
+
+'''
+Plays from the keyboard like a person would - Tab and the arrow keys to get around, a few wrong
+sketches rubbed out again, and now and then a wrong number that gets undone
+
+Parameters:
+logic is the GameLogic to play
+rng is the random.Random to draw from
+
+Return: generator of events
+'''
+
+
+def keyboard_bot(logic, rng):
+    solution = logic.sudoku.board_correct
+    while logic.scene == PLAYING:
+        yield NEXT_EMPTY, None
+        for i in range(rng.randrange(3)):
+            yield MOVE, rng.choice(DIRECTIONS)
+        row, col = logic.selected_cord
+        if logic.board[row][col]:
+            continue  # moved onto a cell that is already filled in, so Tab again
+        answer = solution[row][col]
+        for i in range(rng.randrange(3)):
+            yield SKETCH, rng.randrange(1, 10)
+        for digit in logic.sketched_values.digits(row, col):
+            yield SKETCH, digit  # rub everything out again
+        if rng.random() < 0.1 and logic.model.empty > 1:  # a wrong last number would lose the game
+            yield SKETCH, answer % 9 + 1
+            yield COMMIT, None
+            yield UNDO, None
+            yield ERASE, None
+        yield SKETCH, answer
+        yield COMMIT, None
+
+
+def hint_bot(logic, rng):
+    while logic.scene == PLAYING:
+        yield HINT, None
+        yield COMMIT, None
+
+
+BOTS = {"click": click_bot, "keyboard": keyboard_bot, "hint": hint_bot}
+
+
+'''
+Plays one game with a bot and records every event it sends
+
+Parameters:
+sudoku is the puzzle to play (a copy is played, so it can be played again)
+bot is one of the bots above
+seed is the seed for the bot's choices
+
+Return: tuple (the scene the game ended on, list of (kind, argument) events)
+'''
+
+
+def play(sudoku, bot, seed):
+    trace = []  # what the bot sent, not GameLogic's trace, which has a hint's SELECT and SKETCH instead of HINT
+    logic = GameLogic(SudokuGenerator.from_boards(sudoku.board_original, sudoku.board_correct))
+    for kind, argument in bot(logic, random.Random(seed)):
+        trace.append((kind, argument))
+        logic.handle(kind, argument)
+    return logic.scene, trace
+
+
+'''
+Replays recorded traces on fresh games - untimed for the overall rate, then once more timing every event
+
+Parameters:
+games is a list of (sudoku, trace) pairs
+runs is how many times to replay them for the overall rate
+
+Return: tuple (events per second, dict of kind -> sorted list of seconds per event)
+'''
+
+
+def replay(games, runs=3):
+    events = 0
+    elapsed = 0.0
+    for run in range(runs):
+        for sudoku, trace in games:
+            logic = GameLogic(SudokuGenerator.from_boards(sudoku.board_original, sudoku.board_correct))
+            handle = logic.handle
+            start = time.perf_counter()
+            for kind, argument in trace:
+                handle(kind, argument)
+            elapsed += time.perf_counter() - start
+            events += len(trace)
+
+    latencies = {}
+    clock = time.perf_counter
+    for sudoku, trace in games:
+        logic = GameLogic(SudokuGenerator.from_boards(sudoku.board_original, sudoku.board_correct))
+        handle = logic.handle
+        for kind, argument in trace:
+            start = clock()
+            handle(kind, argument)
+            latencies.setdefault(kind, []).append(clock() - start)
+    for times in latencies.values():
+        times.sort()
+    return events / elapsed, latencies
+
+
+def main(games=20, json_path=None):
+    puzzles = [SudokuGenerator(9, REMOVED, unique=True, seed=seed) for seed in range(games)]
+    metrics = {}
+    for name, bot in BOTS.items():
+        recorded = []
+        for seed, sudoku in enumerate(puzzles):
+            scene, trace = play(sudoku, bot, seed)
+            if scene != WON:
+                raise RuntimeError(f"the {name} bot didn't win game {seed} ({scene})")
+            recorded.append((sudoku, trace))
+        rate, latencies = replay(recorded)
+        metrics[f"{name}.events_per_second"] = rate
+        print(f"{name} bot: {sum(len(trace) for sudoku, trace in recorded) / games:7.1f} events/game   "
+              f"replayed at {rate:10.0f} events/s")
+        for kind, times in sorted(latencies.items()):
+            mean = sum(times) / len(times)
+            p99 = times[min(len(times) - 1, int(len(times) * 0.99))]
+            metrics[f"{name}.{kind}.mean_us"] = mean * 1e6
+            metrics[f"{name}.{kind}.p99_us"] = p99 * 1e6
+            print(f"    {kind:<11} {len(times):7d} events   mean {mean * 1e6:8.2f} us   p99 {p99 * 1e6:8.2f} us")
+
+    if json_path is not None:
+        results = {"commit": commit_hash(), "python": platform.python_version(),
+                   "time": time.strftime("%Y-%m-%d %H:%M:%S"), "metrics": metrics}
+        with open(json_path, "w") as file:
+            json.dump(results, file, indent=1, sort_keys=True)
+        print(f"\nresults saved to {json_path}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    json_path = None
+    if "--json" in args:
+        index = args.index("--json")
+        json_path = args[index + 1]
+        del args[index:index + 2]
+    main(int(args[0]) if args else 20, json_path)
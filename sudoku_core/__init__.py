@@ -0,0 +1,20 @@
+"""
+Everything about a sudoku puzzle that doesn't need a window - generating, solving, grading,
+the board a player fills in and the checks on it
+Nothing in this package imports pygame, so it loads in a few milliseconds and can be used by
+scripts, worker processes and servers. The game itself is in sudoku_ui
+
+"""
+
+from sudoku_core.board import Board, History
+from sudoku_core.board_model import BoardModel
+from sudoku_core.game_logic import GameLogic
+from sudoku_core.generator import (LEVEL_REMOVED, SudokuGenerator, buffered, generate_graded, generate_many,
+                                   generate_sudoku, iter_puzzles, new_sudoku)
+from sudoku_core.grader import EASY, EXPERT, HARD, MEDIUM, grade, meets_level
+from sudoku_core.hints import Hint, HintEngine
+from sudoku_core.navigation import NavigationIndex, find_next_vacant_box
+from sudoku_core.pencil_marks import PencilMarks
+from sudoku_core.solver import DLXSolver, count_solutions, solve, solve_all
+from sudoku_core.symmetry import Transform, canonical_form, derive, random_transform
+from sudoku_core.validation import check_full, check_win, user_input_valid
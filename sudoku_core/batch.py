@@ -0,0 +1,291 @@
+from collections import namedtuple
+
+import numpy as np
+
+from sudoku_core import solver
+
+"""
+Checks and solves whole stacks of boards at once with NumPy
+Boards are an (N, 9, 9) uint8 array (0 for empty) - a list of get_board() boards, or a single one,
+is converted automatically. Every function works on boards up to 25x25, not just 9x9 - candidates are
+uint32 bit masks, and nothing is built per size that grows with it
+
+This is the only module in sudoku_core that needs NumPy, and nothing imports it by default
+
+"""
+
+CHUNK = 16384  # boards handled per step, so the temporary arrays stay a few megabytes
+
+Report = namedtuple("Report", "valid conflicts complete")
+Propagation = namedtuple("Propagation", "boards candidates solved contradiction")
+
+'''
+Converts boards to an (N, size, size) uint8 array
+Raises ValueError for a value above size - it has no digit bit, so the checks would skip over it
+
+Parameters:
+boards is an array or nested lists - one 2D board or a stack of them
+
+Return: numpy.ndarray
+'''
+
+
+def as_boards(boards):
+    boards = np.asarray(boards, dtype=np.uint8)
+    if boards.ndim == 2:
+        boards = boards[None]
+    if boards.ndim != 3 or boards.shape[1] != boards.shape[2]:
+        raise ValueError(f"expected boards of shape (N, size, size), got {boards.shape}")
+    if boards.size and boards.max() > boards.shape[1]:
+        raise ValueError(f"values must be 0 to {boards.shape[1]}, got {boards.max()}")
+    return boards
+
+
+'''
+Keeps only the masks with exactly one bit set (the rest become 0) - m & (m - 1) clears the
+lowest bit, so it is 0 for single bits. Works straight on the masks, so there is no table that
+grows with the board size
+
+Parameters:
+masks is an array of uint32 candidate masks
+
+Return: numpy.ndarray
+'''
+
+
+def _single_bits(masks):
+    return np.where((masks & (masks - np.uint32(1))) == 0, masks, np.uint32(0))
+
+
+'''
+Returns the digit of every single-bit mask (0 where the mask is 0) - a power of two as a float
+has the bit's position + 1 as its exponent, and every mask fits in a float exactly
+
+Parameters:
+masks is an array of single-bit or 0 uint32 masks
+
+Return: numpy.ndarray of uint8
+'''
+
+
+def _digits(masks):
+    exponents = np.frexp(masks.astype(np.float64))[1]
+    return np.where(masks != 0, exponents - 1, 0).astype(np.uint8)
+
+
+'''
+Returns a mask with bit n set for each digit n in every cell (0 for empty cells)
+
+Parameters:
+boards is an (N, size, size) uint8 array
+
+Return: numpy.ndarray of uint32
+'''
+
+
+def _bits(boards):
+    return np.where(boards > 0, np.left_shift(np.uint32(1), boards.astype(np.uint32)), np.uint32(0))
+
+
+'''
+Combines one value per box back up to one per cell
+
+Parameters:
+per_box is an (N, box, box, ...) array
+
+Return: (N, size, size, ...) array
+'''
+
+
+def _spread_boxes(per_box, box):
+    return np.repeat(np.repeat(per_box, box, axis=1), box, axis=2)
+
+
+'''
+Determines which boards have no digit repeated in any row, column or box (empty cells are fine)
+A unit has a repeat exactly when adding up its digit bits carries, so the sum differs from the OR
+
+Parameters:
+boards is anything as_boards accepts
+
+Return: numpy.ndarray of bool, one per board
+'''
+
+
+def is_valid(boards):
+    boards = as_boards(boards)
+    n, size = len(boards), boards.shape[1]
+    box = int(size ** 0.5)
+    bits = _bits(boards)
+    boxes = bits.reshape(n, box, box, box, box).transpose(0, 1, 3, 2, 4).reshape(n, size, size)
+    valid = np.ones(n, dtype=bool)
+    for units in (bits, bits.transpose(0, 2, 1), boxes):
+        valid &= (units.sum(axis=2) == np.bitwise_or.reduce(units, axis=2)).all(axis=1)
+    return valid
+
+
+'''
+Marks every cell whose digit is repeated in its row, column or box
+
+Parameters:
+boards is anything as_boards accepts
+
+Return: numpy.ndarray of bool, the same shape as the boards
+'''
+
+
+def conflict_masks(boards):
+    boards = as_boards(boards)
+    n, size = len(boards), boards.shape[1]
+    box = int(size ** 0.5)
+    digit_bits = np.left_shift(np.uint32(1), np.arange(1, size + 1, dtype=np.uint32))
+    conflicts = np.zeros(boards.shape, dtype=bool)
+    for start in range(0, n, CHUNK):
+        chunk = boards[start:start + CHUNK]
+        onehot = (chunk[..., None] == np.arange(1, size + 1, dtype=np.uint8)).view(np.uint8)  # (N, row, col, digit)
+        # the digits repeated in each row, column and box, as bits
+        repeated = ((onehot.sum(axis=2, dtype=np.uint8) > 1) @ digit_bits)[:, :, None]
+        repeated = repeated | ((onehot.sum(axis=1, dtype=np.uint8) > 1) @ digit_bits)[:, None, :]
+        per_box = onehot.reshape(len(chunk), box, box, box, box, size).sum(axis=(2, 4), dtype=np.uint8) > 1
+        repeated = repeated | _spread_boxes(per_box @ digit_bits, box)
+        conflicts[start:start + CHUNK] = (_bits(chunk) & repeated) != 0
+    return conflicts
+
+
+'''
+Determines which boards are completely and correctly filled in
+
+Parameters:
+boards is anything as_boards accepts
+
+Return: numpy.ndarray of bool, one per board
+'''
+
+
+def is_complete(boards):
+    boards = as_boards(boards)
+    return (boards != 0).all(axis=(1, 2)) & is_valid(boards)
+
+
+'''
+Checks a stack of boards in one go - what check_win and is_valid tell you, for every board
+
+Parameters:
+boards is anything as_boards accepts
+
+Return: Report (valid and complete are one bool per board, conflicts is a bool per cell)
+'''
+
+
+def validate(boards):
+    boards = as_boards(boards)
+    conflicts = conflict_masks(boards)
+    valid = ~conflicts.any(axis=(1, 2))
+    return Report(valid, conflicts, valid & (boards != 0).all(axis=(1, 2)))
+
+
+'''
+Works out which digits can still go in every empty cell
+
+Parameters:
+boards is anything as_boards accepts
+
+Return: numpy.ndarray of uint32 - bit n is set when n is possible (0 for filled cells)
+'''
+
+
+def candidate_masks(boards):
+    boards = as_boards(boards)
+    n, size = len(boards), boards.shape[1]
+    box = int(size ** 0.5)
+    bits = _bits(boards)
+    used = np.bitwise_or.reduce(bits, axis=2)[:, :, None] | np.bitwise_or.reduce(bits, axis=1)[:, None, :]
+    per_box = np.bitwise_or.reduce(bits.reshape(n, box, box, box, box), axis=(2, 4))
+    used |= _spread_boxes(per_box, box)
+    full_mask = np.uint32((1 << (size + 1)) - 2)
+    return np.where(boards == 0, ~used & full_mask, np.uint32(0))
+
+
+'''
+Finds the hidden singles - digits that only one empty cell in a row, column or box can take
+
+Parameters:
+candidates is the (N, size, size) output of candidate_masks
+
+Return: numpy.ndarray of uint32 - the hidden single digits as bits for every cell
+'''
+
+
+def _hidden_singles(candidates):
+    n, size = candidates.shape[:2]
+    box = int(size ** 0.5)
+    digits = np.arange(1, size + 1, dtype=np.uint32)
+    digit_bits = np.left_shift(np.uint32(1), digits)
+    onehot = ((candidates[..., None] >> digits) & 1).astype(np.uint8)  # (N, row, col, digit)
+    # the digits only one cell can take in each row, column and box, as bits
+    only = ((onehot.sum(axis=2, dtype=np.uint8) == 1) @ digit_bits)[:, :, None]
+    only = only | ((onehot.sum(axis=1, dtype=np.uint8) == 1) @ digit_bits)[:, None, :]
+    per_box = onehot.reshape(n, box, box, box, box, size).sum(axis=(2, 4), dtype=np.uint8) == 1
+    return candidates & (only | _spread_boxes(per_box @ digit_bits, box))
+
+
+'''
+Constraint propagation on many boards at once - fills in naked singles (cells with one candidate)
+and hidden singles, round after round, until no board changes
+Every placement is a forced move, so a board that ends up with a repeat or an empty cell with no
+candidates had no solution to begin with
+
+Parameters:
+boards is anything as_boards accepts (it is not changed)
+max_rounds is the most rounds to run (None to run until nothing changes)
+
+Return: Propagation (the boards after propagation, their candidate masks, and one bool per board
+for solved and for contradiction)
+'''
+
+
+def propagate(boards, max_rounds=None):
+    boards = as_boards(boards).copy()
+    for start in range(0, len(boards), CHUNK):
+        chunk = boards[start:start + CHUNK]  # a view, so filling it in fills in boards
+        active = np.arange(len(chunk))  # boards that changed in the last round
+        rounds = 0
+        while len(active) and (max_rounds is None or rounds < max_rounds):
+            rounds += 1
+            current = chunk[active]
+            candidates = candidate_masks(current)
+            singles = _single_bits(candidates)
+            hidden = _single_bits(_hidden_singles(candidates))
+            place = _digits(np.where(singles != 0, singles, hidden))
+            changed = (place != 0).any(axis=(1, 2))
+            chunk[active] = current + place
+            active = active[changed]
+
+    candidates = candidate_masks(boards)
+    empty = boards == 0
+    stuck = (empty & (candidates == 0)).any(axis=(1, 2))
+    valid = is_valid(boards)
+    return Propagation(boards, candidates, valid & ~empty.any(axis=(1, 2)), stuck | ~valid)
+
+
+'''
+Solves a stack of boards - propagation does most of them in bulk, and only the boards it can't
+finish are searched one at a time with the DLX solver
+
+Parameters:
+boards is anything as_boards accepts (it is not changed)
+
+Return: tuple (solved boards array, one bool per board for whether it has a solution)
+'''
+
+
+def solve_boards(boards):
+    result = propagate(boards)
+    solved_boards = result.boards
+    solved = result.solved.copy()
+    for i in np.flatnonzero(~result.solved & ~result.contradiction):
+        solution = solver.solve(solved_boards[i].tolist())
+        if solution is not None:
+            solved_boards[i] = solution
+            solved[i] = True
+    return solved_boards, solved
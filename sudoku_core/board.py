@@ -0,0 +1,241 @@
+from array import array
+
+"""
+A compact read-only board, and an undo/redo history for a BoardModel
+
+Board keeps one byte per cell in a bytes object, so a 9x9 board is 81 bytes of cells instead of
+ten lists of Python ints. It can be indexed like a 2D list (board[row][col]), hashed, compared and
+shared freely because it never changes - replace() makes a new one
+
+History only stores what each move changed, never a copy of the board, so undo, redo and reset
+each cost as much as the number of cells they touch
+
+"""
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+SIZES = (4, 9, 16, 25)  # row lengths from_string accepts
+
+
+class Board:
+    '''
+    Wraps the cells of a board
+
+    Parameters:
+    cells is the board as bytes, row by row, one byte per cell (0 for empty)
+    size is the number of rows/columns of the board
+
+    Return:
+    None
+    '''
+
+    __slots__ = ("size", "cells")
+
+    def __init__(self, cells, size=9):
+        if len(cells) != size * size:
+            raise ValueError(f"a {size}x{size} board needs {size * size} cells, got {len(cells)}")
+        object.__setattr__(self, "size", size)
+        object.__setattr__(self, "cells", bytes(cells))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Board is read-only, use replace() to get a changed copy")
+
+    '''
+    Builds a Board from a 2D list, like the ones SudokuGenerator keeps
+
+    Parameters:
+    board is a 2D list of ints (0 for empty)
+
+    Return: Board
+    '''
+
+    @classmethod
+    def from_lists(cls, board):
+        return cls(bytes(value for board_row in board for value in board_row), len(board))
+
+    def to_lists(self):
+        return [list(self[row]) for row in range(self.size)]
+
+    '''
+    Builds a Board from text with one character per cell, row by row - 0-9 then a-z, so boards
+    up to 25x25 fit ("." also means empty)
+    Only 4x4, 9x9, 16x16 and 25x25 boards are accepted - anything else raises ValueError
+
+    Parameters:
+    text is the board as a string
+
+    Return: Board
+    '''
+
+    @classmethod
+    def from_string(cls, text):
+        size = int(len(text) ** 0.5)
+        if size not in SIZES or size * size != len(text):
+            raise ValueError(f"not a board: {len(text)} cells (boards are 4x4, 9x9, 16x16 or 25x25)")
+        try:
+            board = cls(bytes(0 if char == "." else int(char, 36) for char in text), size)
+        except ValueError:
+            raise ValueError(f"not a board: {text!r}") from None
+        if max(board.cells) > size:
+            raise ValueError(f"not a board: {text!r}")
+        return board
+
+    def to_string(self):
+        return "".join(DIGITS[value] for value in self.cells)
+
+    def __getitem__(self, row):
+        return self.cells[row * self.size:(row + 1) * self.size]
+
+    def __iter__(self):
+        for row in range(self.size):
+            yield self[row]
+
+    def __len__(self):
+        return self.size
+
+    def __eq__(self, other):
+        return isinstance(other, Board) and self.cells == other.cells
+
+    def __hash__(self):
+        return hash(self.cells)
+
+    def __repr__(self):
+        return f"Board({self.cells!r}, {self.size})"
+
+    def get(self, row, col):
+        return self.cells[row * self.size + col]
+
+    '''
+    Returns a copy of the board with one cell changed
+
+    Parameters:
+    row and col are the cell to change
+    value is its new value (0 to clear it)
+
+    Return: Board
+    '''
+
+    def replace(self, row, col, value):
+        i = row * self.size + col
+        return Board(self.cells[:i] + bytes((value,)) + self.cells[i + 1:], self.size)
+
+    def empty_count(self):
+        return self.cells.count(0)
+
+
+class History:
+    '''
+    Starts an empty history for a board model
+    Every change to the board should go through set() or reset() so it can be undone
+
+    Parameters:
+    model is the BoardModel whose changes are recorded
+
+    Return:
+    None
+    '''
+
+    def __init__(self, model):
+        self.model = model
+        self.row_length = model.row_length
+        # each entry is one move: an array of deltas packed as (cell << 16) | (old << 8) | new
+        self.done = []
+        self.undone = []
+
+    def _pack(self, row, col, old, new):
+        return ((row * self.row_length + col) << 16) | (old << 8) | new
+
+    def _record(self, deltas):
+        if deltas:
+            self.done.append(deltas)
+            self.undone.clear()
+
+    '''
+    Puts value in (row, col) and records the move
+
+    Parameters:
+    row and col are the cell to change
+    value is the new value (0 to clear the cell)
+
+    Return: int (the value that was there before)
+    '''
+
+    def set(self, row, col, value):
+        old = self.model.set(row, col, value)
+        if old != value:
+            self._record(array("L", (self._pack(row, col, old, value),)))
+        return old
+
+    '''
+    Puts the board back to the original puzzle as a single move, so it can be undone as well
+
+    Parameters: None
+    Return: list of (row, col, value) tuples (the cells that changed)
+    '''
+
+    def reset(self):
+        model = self.model
+        deltas = array("L")
+        changes = []
+        for row, col in list(model.changed):
+            value = model.original[row][col]
+            deltas.append(self._pack(row, col, model.set(row, col, value), value))
+            changes.append((row, col, value))
+        self._record(deltas)
+        return changes
+
+    '''
+    Applies one move's deltas in either direction
+
+    Parameters:
+    deltas is the move's array of packed deltas
+    backwards is True to put the old values back (undo), False to apply the new ones (redo)
+
+    Return: list of (row, col, value) tuples (the cells that changed)
+    '''
+
+    def _apply(self, deltas, backwards):
+        changes = []
+        for delta in (reversed(deltas) if backwards else deltas):
+            row, col = divmod(delta >> 16, self.row_length)
+            value = (delta >> 8) & 0xff if backwards else delta & 0xff
+            self.model.set(row, col, value)
+            changes.append((row, col, value))
+        return changes
+
+    def can_undo(self):
+        return bool(self.done)
+
+    def can_redo(self):
+        return bool(self.undone)
+
+    '''
+    Takes back the last move
+
+    Parameters: None
+    Return: list of (row, col, value) tuples (the cells that changed, empty if there was nothing to undo)
+    '''
+
+    def undo(self):
+        if not self.done:
+            return []
+        deltas = self.done.pop()
+        self.undone.append(deltas)
+        return self._apply(deltas, True)
+
+    '''
+    Plays the last undone move again
+
+    Parameters: None
+    Return: list of (row, col, value) tuples (the cells that changed, empty if there was nothing to redo)
+    '''
+
+    def redo(self):
+        if not self.undone:
+            return []
+        deltas = self.undone.pop()
+        self.done.append(deltas)
+        return self._apply(deltas, False)
+
+    def clear(self):
+        self.done.clear()
+        self.undone.clear()
@@ -0,0 +1,157 @@
+from sudoku_core.board import Board
+
+"""
+The board a player is filling in, with running counts so the game never has to rescan it
+Every change goes through set(), which keeps these up to date in O(1):
+    empty       how many cells are still 0
+    correct     how many cells match the solution
+    conflicts   how many extra copies of digits there are across all rows, columns and boxes
+                (0 means no row, column or box has a duplicate)
+
+"""
+
+
+class BoardModel:
+    '''
+    Sets up the counts for a puzzle
+
+    Parameters:
+    board_original is the puzzle as it was given (2D list, 0 for empty)
+    solution is the solved board (2D list)
+    board is the 2D list to play on - it is changed in place (None to play on a copy of board_original)
+
+    Return:
+    None
+    '''
+
+    def __init__(self, board_original, solution, board=None):
+        n = len(board_original)
+        self.row_length = n
+        self.box_length = int(n ** 0.5)
+        self.original = board_original
+        self.solution = solution
+        self.board = board if board is not None else [board_row[:] for board_row in board_original]
+        # how many times each digit is in each row, column and box
+        self.row_counts = [[0] * (n + 1) for i in range(n)]
+        self.col_counts = [[0] * (n + 1) for i in range(n)]
+        self.box_counts = [[0] * (n + 1) for i in range(n)]
+        self.empty = 0
+        self.correct = 0
+        self.conflicts = 0
+        self.changed = set()  # cells that differ from board_original, so reset() only touches those
+        for row in range(n):
+            for col in range(n):
+                value = self.board[row][col]
+                if value:
+                    self._add(row, col, value)
+                else:
+                    self.empty += 1
+                if value != board_original[row][col]:
+                    self.changed.add((row, col))
+
+    '''
+    Builds a model that plays directly on a SudokuGenerator's board
+
+    Parameters:
+    sudoku is a SudokuGenerator
+
+    Return: BoardModel
+    '''
+
+    @classmethod
+    def from_sudoku(cls, sudoku):
+        return cls(sudoku.board_original, sudoku.board_correct, sudoku.board)
+
+    def box_index(self, row, col):
+        return (row // self.box_length) * self.box_length + col // self.box_length
+
+    def _add(self, row, col, value):
+        for counts in (self.row_counts[row], self.col_counts[col], self.box_counts[self.box_index(row, col)]):
+            if counts[value]:
+                self.conflicts += 1
+            counts[value] += 1
+        if value == self.solution[row][col]:
+            self.correct += 1
+
+    def _remove(self, row, col, value):
+        for counts in (self.row_counts[row], self.col_counts[col], self.box_counts[self.box_index(row, col)]):
+            counts[value] -= 1
+            if counts[value]:
+                self.conflicts -= 1
+        if value == self.solution[row][col]:
+            self.correct -= 1
+
+    '''
+    Puts value in (row, col) and updates every count
+
+    Parameters:
+    row and col are the cell to change
+    value is the new value (0 to clear the cell)
+
+    Return: int (the value that was there before, so the change can be undone)
+    '''
+
+    def set(self, row, col, value):
+        old = self.board[row][col]
+        if old == value:
+            return old
+        if old:
+            self._remove(row, col, old)
+        else:
+            self.empty -= 1
+        if value:
+            self._add(row, col, value)
+        else:
+            self.empty += 1
+        self.board[row][col] = value
+        if value != self.original[row][col]:
+            self.changed.add((row, col))
+        else:
+            self.changed.discard((row, col))
+        return old
+
+    '''
+    Puts the board back to board_original, only touching the cells that were changed
+
+    Parameters: None
+    Return: None
+    '''
+
+    def reset(self):
+        for row, col in list(self.changed):
+            self.set(row, col, self.original[row][col])
+
+    '''
+    Returns a read-only copy of the board as it is now, e.g. to keep a finished game around
+
+    Parameters: None
+    Return: Board
+    '''
+
+    def snapshot(self):
+        return Board.from_lists(self.board)
+
+    def is_full(self):
+        return self.empty == 0
+
+    def is_won(self):
+        return self.correct == self.row_length * self.row_length
+
+    def has_conflicts(self):
+        return self.conflicts > 0
+
+    '''
+    Determines if the value in (row, col) is repeated in its row, column or box
+
+    Parameters:
+    row and col are the cell to check
+
+    Return: boolean
+    '''
+
+    def is_conflict(self, row, col):
+        value = self.board[row][col]
+        if not value:
+            return False
+        return (self.row_counts[row][value] > 1 or self.col_counts[col][value] > 1
+                or self.box_counts[self.box_index(row, col)][value] > 1)
@@ -0,0 +1,188 @@
+from sudoku_core.board import History
+from sudoku_core.board_model import BoardModel
+from sudoku_core.hints import HintEngine
+from sudoku_core.navigation import NavigationIndex, find_next_vacant_box
+from sudoku_core.pencil_marks import PencilMarks
+from sudoku_core.validation import user_input_valid
+
+"""
+Everything that happens on the board while a game is being played, without the window
+The game window turns keys and clicks into events for GameLogic.handle, and anything else (a test,
+a bot, a recorded trace) can send the same events without pygame
+
+Events are (kind, argument) pairs - the argument is None unless the kind needs one:
+    SELECT      [row, col] to select a cell, or None to select nothing (a click)
+    MOVE        "up", "down", "left" or "right" - to the next cell in that direction the player can fill (arrow keys)
+    NEXT_EMPTY  to the next empty cell (Tab)
+    SKETCH      digit to sketch in the selected cell, or rub out if it is already sketched (1-9)
+    ERASE       rubs out the last sketched digit (Backspace)
+    COMMIT      puts the sketched digit in the selected cell (Enter)
+    NOTES       turns auto-notes on or off (N)
+    UNDO, REDO  (Ctrl+Z, Ctrl+Shift+Z / Ctrl+Y)
+    RESET       puts the board back to the puzzle as given (the Reset button)
+    HINT        selects the easiest next step and sketches its digit (H)
+
+"""
+
+# the screens the game can be on
+MENU = "menu"
+PLAYING = "playing"
+WON = "won"
+LOST = "lost"
+
+SELECT = "select"
+MOVE = "move"
+NEXT_EMPTY = "next empty"
+SKETCH = "sketch"
+ERASE = "erase"
+COMMIT = "commit"
+NOTES = "notes"
+UNDO = "undo"
+REDO = "redo"
+RESET = "reset"
+HINT = "hint"
+
+
+class GameLogic:
+    '''
+    Starts a game on a puzzle
+
+    Parameters:
+    sudoku is the SudokuGenerator to play (its board is changed in place)
+    auto_notes is True to rub a committed number out of the sketches in its row, column and box
+    (off unless asked for - NOTES turns it on or off during the game)
+    wrap is True for MOVE to wrap around to the other side of the board
+    trace is a list to append every handled event to (None to not record them) - a HINT is
+    recorded as the SELECT and SKETCH it turns into, so replaying a trace never depends on the
+    hint engine's state
+
+    Return:
+    None
+    '''
+
+    def __init__(self, sudoku, auto_notes=False, wrap=False, trace=None):
+        self.sudoku = sudoku
+        self.model = BoardModel.from_sudoku(sudoku)
+        self.board = self.model.board
+        self.history = History(self.model)
+        self.nav = NavigationIndex(sudoku.board_original, wrap=wrap)
+        self.sketched_values = PencilMarks(self.model.row_length)
+        self.hints = None  # built by the first HINT, since most games never ask for one
+        self.selected_cord = None
+        self.auto_notes = auto_notes
+        self.scene = PLAYING
+        self.last_hint = None
+        self.trace = trace
+        self.handlers = {SELECT: self.select, MOVE: self.move, NEXT_EMPTY: self.next_empty,
+                         SKETCH: self.sketch, ERASE: self.erase, COMMIT: self.commit, NOTES: self.toggle_notes,
+                         UNDO: self.undo, REDO: self.redo, RESET: self.reset, HINT: self.hint}
+
+    '''
+    Applies one event
+    Events that come after the game is won or lost are ignored
+
+    Parameters:
+    kind is one of the event kinds above
+    argument is the event's argument (None if it doesn't take one)
+
+    Return: str (the scene afterwards - PLAYING, WON or LOST)
+    '''
+
+    def handle(self, kind, argument=None):
+        if self.trace is not None and kind != HINT:
+            self.trace.append((kind, argument))
+        if self.scene == PLAYING:
+            self.handlers[kind](argument)
+        return self.scene
+
+    '''
+    Moves to WON or LOST once every cell is filled in - the model keeps running counts, so this
+    never scans the board
+
+    Parameters: None
+    Return: None
+    '''
+
+    def check_board(self):
+        if self.model.is_full():
+            self.scene = WON if self.model.is_won() else LOST
+
+    def apply_history(self, changes):
+        for row, col, value in changes:
+            self.nav.update(row, col, value)
+        if changes:
+            self.check_board()
+
+    def select(self, cord):
+        self.selected_cord = cord
+
+    def move(self, direction):
+        if self.selected_cord is not None:
+            self.selected_cord = find_next_vacant_box(self.selected_cord, direction, self.sudoku, self.nav) or self.selected_cord
+
+    def next_empty(self, argument=None):
+        self.selected_cord = self.nav.next_empty(self.selected_cord) or self.selected_cord
+
+    def sketch(self, digit):
+        if self.selected_cord is not None and user_input_valid(self.selected_cord, self.sudoku):
+            self.sketched_values.toggle(self.selected_cord[0], self.selected_cord[1], digit)
+
+    def erase(self, argument=None):
+        if self.selected_cord is not None:
+            self.sketched_values.remove_last(self.selected_cord[0], self.selected_cord[1])
+
+    '''
+    Puts the digit Enter would commit (see PencilMarks.last) in the selected cell, if it is one
+    the player can fill
+
+    Parameters: None
+    Return: None
+    '''
+
+    def commit(self, argument=None):
+        if self.selected_cord is None:
+            return
+        row, col = self.selected_cord
+        value = self.sketched_values.last(row, col)
+        if value and user_input_valid(self.selected_cord, self.sudoku):
+            self.history.set(row, col, value)
+            self.nav.update(row, col, value)
+            self.sketched_values.clear(row, col)
+            if self.auto_notes:
+                self.sketched_values.eliminate(row, col, value)
+            self.check_board()
+
+    def toggle_notes(self, argument=None):
+        self.auto_notes = not self.auto_notes
+
+    def undo(self, argument=None):
+        self.apply_history(self.history.undo())
+
+    def redo(self, argument=None):
+        self.apply_history(self.history.redo())
+
+    def reset(self, argument=None):
+        self.history.reset()  # one move, so UNDO brings the cleared numbers back
+        self.nav.reset()
+        self.selected_cord = None
+        self.sketched_values.clear_all()
+        self.check_board()
+
+    '''
+    Selects the cell of the easiest next step and sketches its digit there, so COMMIT fills it in
+    The hint is kept in last_hint so a front end can show the technique. The selecting and
+    sketching go through handle(), so they are what gets traced
+
+    Parameters: None
+    Return: None
+    '''
+
+    def hint(self, argument=None):
+        if self.hints is None:
+            self.hints = HintEngine(self.sudoku.board_original, self.sudoku.board_correct)
+        hint = self.last_hint = self.hints.hint(self.board, self.sketched_values)
+        if hint is None:
+            return
+        self.handle(SELECT, [hint.row, hint.col])
+        if not self.sketched_values.has(hint.row, hint.col, hint.digit):
+            self.handle(SKETCH, hint.digit)
@@ -0,0 +1,745 @@
+import copy
+import os
+import queue
+import random
+import threading
+
+from sudoku_core import grader
+from sudoku_core.board import Board
+
+"""
+This was adapted from a GeeksforGeeks article "Program for Sudoku Generator" by Aarti_Rathi and Ankur Trisal
+https://www.geeksforgeeks.org/program-sudoku-generator/
+
+"""
+
+BANK_PATH = "puzzles.bank"  # built with: python3 -m sudoku_core.puzzle_bank puzzles.bank 1000
+# how many cells to try removing when generating a puzzle for each graded level
+LEVEL_REMOVED = {grader.EASY: 30, grader.MEDIUM: 55, grader.HARD: 81}
+# most cells one uniqueness check may try on boards bigger than 9x9 before it gives up and keeps the
+# clue - 9x9 checks stay under ~10k and aren't limited (so seeded 9x9 puzzles don't change), but with
+# many cells removed a 16x16 search can run for minutes
+SEARCH_NODES = 1000
+
+
+class SudokuGenerator:
+    '''
+	create a sudoku board - initialize class variables and set up the 2D board
+	This should initialize:
+	self.row_length		- the length of each row
+	self.removed_cells	- the total number of cells to be removed
+	self.board			- a 2D list of ints to represent the board
+	self.box_length		- the square root of row_length
+	self.unique			- whether remove_cells keeps the puzzle to exactly one solution
+	self.rng			- the random.Random every random choice is drawn from
+
+	Parameters:
+    row_length is the number of rows/columns of the board (always 9 for this project)
+    removed_cells is an integer value - the number of cells to be removed
+    unique is True to only remove cells that keep the solution unique (fewer cells may be removed)
+    seed makes the puzzle reproducible - the same arguments and seed always give the same puzzle (None for a random one)
+
+	Return:
+	None
+    '''
+
+    def __init__(self, row_length, removed_cells, unique=False, seed=None):
+        self.row_length = row_length
+        self.removed_cells = removed_cells
+        self.unique = unique
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.box_length = int(row_length ** 0.5)
+        if self.box_length * self.box_length != row_length:
+            raise ValueError(f"row_length must be a perfect square (4, 9, 16, 25), got {row_length}")
+        self.fill_solution()
+        self.board_correct = copy.deepcopy(self.board)  # used to see if matches correct answer
+        self.remove_cells()
+        self.board_original = copy.deepcopy(
+            self.board)  # used to see where valid player inputs are and the og board with spots removed
+
+    '''
+	Sets up a blank board and empty row, column and box masks
+	When there is a board already (regenerate), its lists are blanked and reused
+
+	Parameters: None
+	Return: None
+    '''
+
+    def clear_board(self):
+        if getattr(self, "board", None) is not None:
+            blank_row = self.board_blank[0]
+            for board_row in self.board:
+                board_row[:] = blank_row
+            for masks in (self.row_masks, self.col_masks, self.box_masks):
+                masks[:] = blank_row
+            return
+        self.board_blank = [[0 for i in range(self.row_length)] for i in range(self.row_length)]
+        self.board = copy.deepcopy(self.board_blank)  # active player board ***TEMPORARILY**** Blank
+        # one bitmask per row, column and box - bit n is set when digit n is used in that unit
+        self.row_masks = [0] * self.row_length
+        self.col_masks = [0] * self.row_length
+        self.box_masks = [0] * self.row_length
+        self.full_mask = (1 << (self.row_length + 1)) - 2  # bits 1..row_length
+
+    '''
+	Builds a SudokuGenerator around a puzzle that already exists (e.g. one loaded from a puzzle bank)
+	instead of generating a new one
+
+	Parameters:
+	board is the puzzle as a 2D list (0 for empty)
+	solution is the solved board as a 2D list
+
+	Return: SudokuGenerator
+    '''
+
+    @classmethod
+    def from_boards(cls, board, solution):
+        sudoku = cls.__new__(cls)
+        sudoku.row_length = len(board)
+        sudoku.unique = False
+        sudoku.seed = None
+        sudoku.rng = random.Random()
+        sudoku.box_length = int(sudoku.row_length ** 0.5)
+        sudoku.clear_board()
+        sudoku.given_cells = set()
+        for row in range(sudoku.row_length):
+            for col in range(sudoku.row_length):
+                if board[row][col] != 0:
+                    sudoku.place(row, col, board[row][col])
+                    sudoku.given_cells.add((row, col))
+        sudoku.removed_cells = sudoku.row_length * sudoku.row_length - len(sudoku.given_cells)
+        sudoku.board_correct = copy.deepcopy(solution)
+        sudoku.board_original = copy.deepcopy(sudoku.board)
+        return sudoku
+
+    '''
+	Replaces the puzzle with a new one of the same size and difficulty, reusing every list the
+	generator already has instead of allocating new ones
+	Anything still holding board, board_correct or board_original sees them change
+
+	Parameters: None
+	Return: None
+    '''
+
+    def regenerate(self):
+        self.fill_solution()
+        for row in range(self.row_length):
+            self.board_correct[row][:] = self.board[row]
+        self.remove_cells()
+        for row in range(self.row_length):
+            self.board_original[row][:] = self.board[row]
+
+    '''
+	Returns a 2D python list of numbers which represents the board
+
+	Parameters: None
+	Return: list[list]
+    '''
+
+    def get_board(self):
+        return self.board
+
+    '''
+	Displays the board to the console
+    This is not strictly required, but it may be useful for debugging purposes
+
+	Parameters: None
+	Return: None
+    '''
+
+    def print_board(self):
+        for i in range(self.row_length):
+            print(self.board[i])
+
+    '''
+	Returns the index of the box containing (row, col)
+	Boxes are numbered left to right, top to bottom starting at 0
+
+	Parameters:
+	row and col are the row index and col index of the cell
+
+	Return: int
+    '''
+
+    def box_index(self, row, col):
+        return (row // self.box_length) * self.box_length + col // self.box_length
+
+    '''
+	Puts num into the board at (row, col) and marks it as used in the row, column and box masks
+	Any value already in the cell is taken out first so the masks stay in sync
+
+	Parameters:
+	row and col are the row index and col index of the cell
+	num is the value to place
+
+	Return: None
+    '''
+
+    def place(self, row, col, num):
+        if self.board[row][col] != 0:
+            self.unplace(row, col)
+        bit = 1 << num
+        self.board[row][col] = num
+        self.row_masks[row] |= bit
+        self.col_masks[col] |= bit
+        self.box_masks[self.box_index(row, col)] |= bit
+
+    '''
+	Clears the cell at (row, col) and frees its value in the row, column and box masks
+
+	Parameters:
+	row and col are the row index and col index of the cell
+
+	Return: None
+    '''
+
+    def unplace(self, row, col):
+        num = self.board[row][col]
+        if num == 0:
+            return
+        bit = ~(1 << num)
+        self.board[row][col] = 0
+        self.row_masks[row] &= bit
+        self.col_masks[col] &= bit
+        self.box_masks[self.box_index(row, col)] &= bit
+
+    '''
+	Returns the digits that can still go in (row, col) as a bitmask
+	Bit n is set when n is not used in the cell's row, column or box
+
+	Parameters:
+	row and col are the row index and col index of the cell
+
+	Return: int
+    '''
+
+    def candidates(self, row, col):
+        used = self.row_masks[row] | self.col_masks[col] | self.box_masks[self.box_index(row, col)]
+        return self.full_mask & ~used
+
+    '''
+	Determines if num is contained in the specified row (horizontal) of the board
+    If num is already in the specified row, return False. Otherwise, return True
+
+	Parameters:
+	row is the index of the row we are checking
+	num is the value we are looking for in the row
+
+	Return: boolean
+    '''
+
+    def valid_in_row(self, row, num):
+        return not (self.row_masks[row] >> num) & 1
+
+    '''
+	Determines if num is contained in the specified column (vertical) of the board
+    If num is already in the specified col, return False. Otherwise, return True
+
+	Parameters:
+	col is the index of the column we are checking
+	num is the value we are looking for in the column
+
+	Return: boolean
+    '''
+
+    def valid_in_col(self, col, num):
+        return not (self.col_masks[col] >> num) & 1
+
+    '''
+	Determines if num is contained in the 3x3 box specified on the board
+    If num is in the specified box starting at (row_start, col_start), return False.
+    Otherwise, return True
+
+	Parameters:
+	row_start and col_start are the starting indices of the box to check
+	i.e. the box is from (row_start, col_start) to (row_start+2, col_start+2)
+	num is the value we are looking for in the box
+
+	Return: boolean
+    '''
+
+    def valid_in_box(self, row_start, col_start, num):
+        return not (self.box_masks[self.box_index(row_start, col_start)] >> num) & 1
+
+    '''
+       Determines if it is valid to enter num at (row, col) in the board
+       This is done by checking that num is unused in the appropriate, row, column, and box
+
+       Parameters:
+       row and col are the row index and col index of the cell to check in the board
+       num is the value to test if it is safe to enter in this cell
+
+       Return: boolean
+       '''
+
+    def is_valid(self, row, col, num):
+        used = self.row_masks[row] | self.col_masks[col] | self.box_masks[self.box_index(row, col)]
+        return not (used >> num) & 1
+
+    '''
+    Fills the specified 3x3 box with values
+    For each position, picks a random digit which has not yet been used in the box
+
+	Parameters:
+	row_start and col_start are the starting indices of the box to check
+	i.e. the box is from (row_start, col_start) to (row_start+2, col_start+2)
+
+	Return: None
+    '''
+
+    def fill_box(self, row_start, col_start):
+        for row in range(row_start, row_start + self.box_length):
+            for col in range(col_start, col_start + self.box_length):  # iterations
+                self.unplace(row, col)
+                free = self.candidates(row, col)
+                term = self.rng.choice([num for num in range(1, self.row_length + 1) if (free >> num) & 1])
+                self.place(row, col, term)
+
+    '''
+    Fills the three boxes along the main diagonal of the board
+    These are the boxes which start at (0,0), (3,3), and (6,6)
+
+	Parameters: None
+	Return: None
+    '''
+
+    def fill_diagonal(self):
+        for i in range(self.box_length):
+            self.fill_box(i * self.box_length, i * self.box_length)
+
+    '''
+    DO NOT CHANGE
+    Provided for students
+    Fills the remaining cells of the board
+    Should be called after the diagonal boxes have been filled
+    Only practical for 9x9 boards - larger boards are filled by fill_solution instead
+
+	Parameters:
+	row, col specify the coordinates of the first empty (0) cell
+
+	Return:
+	boolean (whether or not we could solve the board)
+    '''
+
+    def fill_remaining(self, row, col):
+        if (col >= self.row_length and row < self.row_length - 1):
+            row += 1
+            col = 0
+        if row >= self.row_length and col >= self.row_length:
+            return True
+        if row < self.box_length:
+            if col < self.box_length:
+                col = self.box_length
+        elif row < self.row_length - self.box_length:
+            if col == int(row // self.box_length * self.box_length):
+                col += self.box_length
+        else:
+            if col == self.row_length - self.box_length:
+                row += 1
+                col = 0
+                if row >= self.row_length:
+                    return True
+
+        for num in range(1, self.row_length + 1):
+            if self.is_valid(row, col, num):
+                self.place(row, col, num)
+                if self.fill_remaining(row, col + 1):
+                    return True
+                self.unplace(row, col)
+        return False
+
+    '''
+    DO NOT CHANGE
+    Provided for students
+    Constructs a solution by calling fill_diagonal and fill_remaining
+
+	Parameters: None
+	Return: None
+    '''
+
+    def fill_values(self):
+        self.fill_diagonal()
+        self.fill_remaining(0, self.box_length)
+
+    '''
+    Fills a blank board with a complete random solution for any board size
+    The diagonal boxes are filled first, then fill_remaining_mrv does the rest
+    If a search gets stuck for too long the board is cleared and started again with a new diagonal,
+    which keeps 16x16 and 25x25 boards from getting lost in a huge backtracking tree
+
+	Parameters:
+	max_backtracks is how many dead ends one attempt may hit before starting over
+
+	Return: None
+    '''
+
+    def fill_solution(self, max_backtracks=None):
+        if max_backtracks is None:
+            max_backtracks = self.row_length * self.row_length // 4
+        self.restarts = 0
+        while True:
+            self.clear_board()
+            self.fill_diagonal()
+            if self.fill_remaining_mrv(max_backtracks):
+                return
+            self.restarts += 1
+
+    '''
+    Fills the remaining cells by always picking the empty cell with the fewest candidates (MRV),
+    trying its candidates in random order
+
+	Parameters:
+	max_backtracks is how many dead ends to allow before giving up
+
+	Return:
+	boolean (whether or not we could fill the board)
+    '''
+
+    def fill_remaining_mrv(self, max_backtracks):
+        empty = [(row, col) for row in range(self.row_length) for col in range(self.row_length)
+                 if self.board[row][col] == 0]
+        self.backtracks = 0
+        return self._fill_mrv(empty, max_backtracks)
+
+    def _fill_mrv(self, empty, max_backtracks):
+        if not empty:
+            return True
+        best = -1
+        best_free = 0
+        best_count = self.row_length + 1
+        for i, (row, col) in enumerate(empty):
+            free = self.candidates(row, col)
+            count = free.bit_count()
+            if count < best_count:
+                best, best_free, best_count = i, free, count
+                if count <= 1:
+                    break
+        if best_count == 0:
+            self.backtracks += 1
+            return False
+
+        empty[best], empty[-1] = empty[-1], empty[best]
+        row, col = empty.pop()
+        nums = [num for num in range(1, self.row_length + 1) if (best_free >> num) & 1]
+        self.rng.shuffle(nums)
+        for num in nums:
+            self.place(row, col, num)
+            if self._fill_mrv(empty, max_backtracks):
+                return True
+            self.unplace(row, col)
+            if self.backtracks > max_backtracks:
+                break
+        empty.append((row, col))
+        empty[best], empty[-1] = empty[-1], empty[best]
+        return False
+
+    '''
+    Removes the appropriate number of cells from the board
+    This is done by setting some values to 0
+    Should be called after the entire solution has been constructed
+    i.e. after fill_values has been called
+
+    NOTE: Be careful not to 'remove' the same cell multiple times
+    i.e. if a cell is already 0, it cannot be removed again
+
+	Parameters: None
+	Return: None
+    '''
+
+    def remove_cells(self):
+        cells = [(row, col) for row in range(self.row_length) for col in range(self.row_length)
+                 if self.board[row][col] != 0]
+        self.rng.shuffle(cells)  # every cell is tried at most once, so no retry loop is needed
+        self.given_cells = set(cells)  # cells that still hold a clue
+        removed = 0
+        for row, col in cells:
+            if removed >= self.removed_cells:
+                break
+            if self.unique:
+                if not self.remove_keeps_unique(row, col):
+                    continue
+            else:
+                self.unplace(row, col)
+            self.given_cells.discard((row, col))
+            removed += 1
+
+    '''
+    Blanks (row, col) only if the puzzle still has exactly one solution afterwards
+    The board is unique before the call, so a second solution has to put a different digit in
+    this cell - each other candidate is tried with count_solutions(1) on the live masks
+    On boards bigger than 9x9 a search that runs out of nodes (see SEARCH_NODES) counts as finding a
+    second solution, so the clue stays and the puzzle is still unique
+
+	Parameters:
+	row and col are the row index and col index of the filled cell to remove
+
+	Return: boolean (whether or not the cell was removed)
+    '''
+
+    def remove_keeps_unique(self, row, col):
+        num = self.board[row][col]
+        self.unplace(row, col)
+        others = self.candidates(row, col) & ~(1 << num)
+        while others:
+            bit = others & -others
+            others ^= bit
+            self.place(row, col, bit.bit_length() - 1)
+            found = self.count_solutions(1, SEARCH_NODES if self.row_length > 9 else None)
+            self.unplace(row, col)
+            if found:
+                self.place(row, col, num)
+                return False
+        return True
+
+    '''
+    Counts the solutions of the current board, stopping once limit is reached
+    Searches in place on the row/column/box masks, always filling the cell with the fewest
+    candidates next, and leaves the board as it found it
+
+	Parameters:
+	limit is the count to stop at (2 is enough to tell if a puzzle is unique)
+	max_nodes is the most cells to try filling in (None for no limit)
+
+	Return: int (limit if the search ran out of nodes first, since it couldn't rule more out)
+    '''
+
+    def count_solutions(self, limit=2, max_nodes=None):
+        empty = [(row, col) for row in range(self.row_length) for col in range(self.row_length)
+                 if self.board[row][col] == 0]
+        self.nodes_left = max_nodes
+        return self._count_solutions(empty, limit)
+
+    def _count_solutions(self, empty, limit):
+        if not empty:
+            return 1
+        if self.nodes_left is not None:
+            if self.nodes_left <= 0:
+                return limit
+            self.nodes_left -= 1
+        best = -1
+        best_free = 0
+        best_count = self.row_length + 1
+        for i, (row, col) in enumerate(empty):
+            free = self.candidates(row, col)
+            count = free.bit_count()
+            if count < best_count:
+                best, best_free, best_count = i, free, count
+                if count <= 1:
+                    break
+        if best_count == 0:
+            return 0
+
+        # take the chosen cell out of the list while we recurse, then put it back where it was
+        empty[best], empty[-1] = empty[-1], empty[best]
+        row, col = empty.pop()
+        found = 0
+        while best_free and found < limit:
+            bit = best_free & -best_free
+            best_free ^= bit
+            self.place(row, col, bit.bit_length() - 1)
+            found += self._count_solutions(empty, limit - found)
+            self.unplace(row, col)
+        empty.append((row, col))
+        empty[best], empty[-1] = empty[-1], empty[best]
+        return found
+
+
+'''
+Given a number of rows and number of cells to remove, this function:
+1. creates a SudokuGenerator, which fills its values and saves this as the solved state
+2. removes the appropriate number of cells (also done by the constructor)
+3. returns the representative 2D Python Lists of the board
+
+Parameters:
+size is the number of rows/columns of the board (9 for this project)
+removed is the number of cells to clear (set to 0)
+
+Return: list[list] (a 2D Python list to represent the board)
+'''
+
+
+def generate_sudoku(size, removed):
+    sudoku = SudokuGenerator(size, removed)  # __init__ already fills and removes, so don't do it twice
+    return sudoku.get_board()
+
+
+'''
+Builds one chunk of puzzles inside a worker process
+Each puzzle's seed is drawn from the chunk's seed, so the same seed always gives the same chunk
+no matter which worker picks it up
+
+Parameters:
+task is a tuple (size, removed, unique, count, seed)
+
+Return: list of (board, solution, seed) tuples - SudokuGenerator(size, removed, unique, seed)
+makes the same puzzle again
+'''
+
+
+def _generate_chunk(task):
+    size, removed, unique, count, seed = task
+    rng = random.Random(seed)
+    chunk = []
+    for i in range(count):
+        puzzle_seed = rng.getrandbits(64)
+        sudoku = SudokuGenerator(size, removed, unique, puzzle_seed)
+        chunk.append((sudoku.board, sudoku.board_correct, puzzle_seed))
+    return chunk
+
+
+'''
+Generates n puzzles spread over a pool of worker processes
+Chunks are yielded as soon as each one finishes (not in order), so callers can start
+using puzzles before the whole batch is done
+
+Parameters:
+n is the number of puzzles to make
+removed is the number of cells to clear in each puzzle
+workers is the number of processes (None for one per core, 1 to run in this process)
+chunk_size is the number of puzzles each worker builds per task
+seed makes the set of puzzles reproducible (None for a random seed)
+size is the number of rows/columns of each board
+unique is passed on to SudokuGenerator
+
+Return: generator of lists of (board, solution, seed) tuples (see _generate_chunk)
+'''
+
+
+def generate_many(n, removed, workers=None, chunk_size=100, seed=None, size=9, unique=False):
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    tasks = []
+    for index, start in enumerate(range(0, n, chunk_size)):
+        tasks.append((size, removed, unique, min(chunk_size, n - start), seed + index))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for task in tasks:
+            yield _generate_chunk(task)
+        return
+
+    import multiprocessing  # only needed for real worker processes, so plain imports stay fast
+
+    with multiprocessing.Pool(workers) as pool:
+        for chunk in pool.imap_unordered(_generate_chunk, tasks):
+            yield chunk
+
+
+'''
+Yields an endless stream of puzzles for a difficulty, one at a time
+A single SudokuGenerator is regenerated for every puzzle, so memory stays the same however many
+are taken. Each puzzle comes out as read-only Boards, which stay valid after the generator moves on
+
+Parameters:
+difficulty is grader.EASY, MEDIUM or HARD
+seed makes the stream reproducible (None for random puzzles)
+graded is True to skip puzzles that don't grade at the difficulty (like generate_graded)
+
+Return: generator of (puzzle, solution) Board tuples
+'''
+
+
+def iter_puzzles(difficulty, seed=None, graded=True):
+    sudoku = SudokuGenerator(9, LEVEL_REMOVED[difficulty], unique=True, seed=seed)
+    while True:
+        if not graded or grader.meets_level(grader.grade(sudoku.board), difficulty):
+            yield Board.from_lists(sudoku.board), Board.from_lists(sudoku.board_correct)
+        sudoku.regenerate()
+
+
+'''
+Runs an iterator on a background thread and hands its items over through a bounded queue
+The producer stops as soon as maxsize items are waiting, so a slow consumer (a disk writer,
+a grader) throttles it instead of letting items pile up in memory. Closing the returned
+generator (or breaking out of a for loop over it) stops the producer as well
+
+Parameters:
+items is the iterator to run in the background (e.g. iter_puzzles(...))
+maxsize is the most items waiting to be consumed
+
+Return: generator of the same items, in order
+'''
+
+
+def buffered(items, maxsize=16):
+    ready = queue.Queue(maxsize)
+    stopped = threading.Event()
+
+    def put(entry):
+        while not stopped.is_set():
+            try:
+                ready.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put((True, item)):
+                    return
+        except Exception as error:
+            put((False, error))
+        else:
+            put((False, None))
+
+    threading.Thread(target=produce, name="puzzle-producer", daemon=True).start()
+    try:
+        while True:
+            more, item = ready.get()
+            if not more:
+                if item is not None:
+                    raise item
+                return
+            yield item
+    finally:
+        stopped.set()
+
+
+'''
+Generates unique puzzles until one grades at the requested level
+If none of the attempts hit the level the last puzzle is returned anyway, so this always finishes
+
+Parameters:
+level is grader.EASY, MEDIUM or HARD
+attempts is the most puzzles to try
+seed makes the result reproducible (None for a random puzzle)
+
+Return: SudokuGenerator
+'''
+
+
+def generate_graded(level, attempts=200, seed=None):
+    rng = random.Random(seed)
+    for i in range(attempts):
+        sudoku = SudokuGenerator(9, LEVEL_REMOVED[level], unique=True, seed=rng.getrandbits(64))
+        if grader.meets_level(grader.grade(sudoku.board), level):
+            break
+    return sudoku
+
+
+'''
+Gets a puzzle for the difficulty menu, taking it from the puzzle bank file when there is one
+and only generating a new puzzle if there isn't
+
+Parameters:
+difficulty is grader.EASY, MEDIUM or HARD
+
+Return: SudokuGenerator
+'''
+
+
+def new_sudoku(difficulty):
+    if os.path.exists(BANK_PATH):
+        from sudoku_core.puzzle_bank import PuzzleBank
+
+        try:
+            with PuzzleBank(BANK_PATH) as bank:
+                board, solution, level, seed = bank.random(difficulty)
+            return SudokuGenerator.from_boards(board, solution)
+        except (ValueError, LookupError):
+            pass  # unreadable bank or nothing at this difficulty, so just generate one
+    return generate_graded(difficulty)
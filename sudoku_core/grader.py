@@ -0,0 +1,471 @@
+import threading
+from collections import namedtuple
+
+"""
+Grades a puzzle by solving it the way a person would, with a fixed pipeline of logical techniques
+The easiest technique that makes progress is always used, and the grade comes from which
+techniques were needed and how often
+
+Ratings roughly follow Sudoku Explainer's scale
+http://sudopedia.enjoysudoku.com/SE.html
+
+"""
+
+EASY = 0
+MEDIUM = 1
+HARD = 2
+EXPERT = 3  # the techniques here can't finish it, so it needs guessing or something stronger
+LEVEL_NAMES = {EASY: "Easy", MEDIUM: "Medium", HARD: "Hard", EXPERT: "Expert"}
+
+Grade = namedtuple("Grade", "level score hardest techniques solved board")
+Grade.__doc__ = '''
+    level is EASY, MEDIUM, HARD or EXPERT
+    score is the sum of the ratings of every step taken
+    hardest is the name of the hardest technique used (None if the board was already full)
+    techniques is a dict of technique name -> number of times it was used
+    solved is whether the techniques finished the board
+    board is the board as far as the techniques got (2D list)
+'''
+
+
+class Grader:
+    '''
+    Holds the lookup tables for one board size and runs the technique pipeline
+    The tables (units, peers, which units a cell is in) are built once in __init__
+    Candidates are kept as one bitmask per cell in a flat list - placing a digit only touches
+    that cell's peers, so nothing is recomputed from the whole board after a deduction
+
+    Parameters:
+    row_length is the number of rows/columns of the board
+
+    Return:
+    None
+    '''
+
+    def __init__(self, row_length=9):
+        n = row_length
+        box = int(n ** 0.5)
+        if box * box != n:
+            raise ValueError(f"row_length must be a perfect square, got {row_length}")
+        self.row_length = n
+        self.box_length = box
+        self.full_mask = (1 << (n + 1)) - 2
+        self.rows = [tuple(row * n + col for col in range(n)) for row in range(n)]
+        self.cols = [tuple(row * n + col for row in range(n)) for col in range(n)]
+        self.boxes = [tuple((box_row + r) * n + box_col + c for r in range(box) for c in range(box))
+                      for box_row in range(0, n, box) for box_col in range(0, n, box)]
+        self.units = self.rows + self.cols + self.boxes
+        self.cell_box = [(i // n // box) * box + (i % n) // box for i in range(n * n)]
+        self.peers = []
+        for i in range(n * n):
+            row, col = divmod(i, n)
+            peers = set(self.rows[row]) | set(self.cols[col]) | set(self.boxes[self.cell_box[i]])
+            peers.discard(i)
+            self.peers.append(tuple(sorted(peers)))
+        # where boxes and lines cross, for pointing and claiming: for every box, its rows and then its
+        # columns as (cells of the box in the line, cells of the line outside the box), and for every
+        # line, the boxes it goes through as (cells of the line in the box, cells of the box outside the line)
+        self.box_lines = []
+        for box_cells in self.boxes:
+            crossings = ([], [])
+            for lines, crossing in ((self.rows, crossings[0]), (self.cols, crossings[1])):
+                for line in lines:
+                    inside = tuple(i for i in line if i in box_cells)
+                    if inside:
+                        crossing.append((inside, tuple(i for i in line if i not in box_cells)))
+            self.box_lines.append(crossings)
+        self.line_boxes = []
+        for line in self.rows + self.cols:
+            self.line_boxes.append([(tuple(i for i in box_cells if i in line), tuple(i for i in box_cells if i not in line))
+                                    for box_cells in self.boxes if set(box_cells) & set(line)])
+
+        # (name, rating, method) in the order they are tried - singles are handled in grade() itself
+        self.pipeline = (
+            ("Pointing", 2.6, self.pointing),
+            ("Claiming", 2.8, self.claiming),
+            ("Naked Pair", 3.0, self.naked_pair),
+            ("X-Wing", 3.2, self.x_wing),
+            ("Hidden Pair", 3.4, self.hidden_pair),
+        )
+        self.medium_rating = 2.6
+        self.hard_rating = 3.2
+
+    '''
+    Sets up candidates for a board and places its givens
+
+    Parameters:
+    board is a 2D list of ints (0 for empty)
+
+    Return: boolean (False if the givens already contradict each other)
+    '''
+
+    def load(self, board):
+        n = self.row_length
+        self.values = [value for board_row in board for value in board_row]
+        self.cand = [self.full_mask] * (n * n)
+        self.singles = []
+        self.broken = False
+        for i, value in enumerate(self.values):
+            if value:
+                if not (self.cand[i] >> value) & 1:
+                    return False
+                self.assign(i, value)
+        return not self.broken
+
+    '''
+    Puts value in cell i and removes it from the candidates of every peer
+
+    Parameters:
+    i is the flat cell index (row * row_length + col)
+    value is the digit to place
+
+    Return: None
+    '''
+
+    def assign(self, i, value):
+        cand = self.cand
+        self.values[i] = value
+        cand[i] = 0
+        bit = 1 << value
+        for peer in self.peers[i]:
+            mask = cand[peer]
+            if mask & bit:
+                mask &= ~bit
+                cand[peer] = mask
+                if mask & (mask - 1) == 0:
+                    if mask == 0:
+                        self.broken = True
+                    else:
+                        self.singles.append(peer)
+
+    '''
+    Removes candidates from a cell
+
+    Parameters:
+    i is the flat cell index
+    bits is the mask of candidates to remove
+
+    Return: boolean (whether anything was removed)
+    '''
+
+    def eliminate(self, i, bits):
+        mask = self.cand[i]
+        if not mask & bits:
+            return False
+        mask &= ~bits
+        self.cand[i] = mask
+        if mask & (mask - 1) == 0:
+            if mask == 0:
+                self.broken = True
+            else:
+                self.singles.append(i)
+        return True
+
+    '''
+    Places the next naked single waiting in the queue, if there is one
+
+    Parameters: None
+    Return: boolean (whether a digit was placed)
+    '''
+
+    def naked_single(self):
+        while self.singles:
+            i = self.singles.pop()
+            mask = self.cand[i]
+            if self.values[i] == 0 and mask and mask & (mask - 1) == 0:
+                self.assign(i, mask.bit_length() - 1)
+                return True
+        return False
+
+    '''
+    Places every digit that has only one possible cell in some unit
+
+    Parameters: None
+    Return: int (how many digits were placed)
+    '''
+
+    def hidden_single(self):
+        cand = self.cand
+        placed = 0
+        for unit in self.units:
+            once = 0
+            twice = 0
+            for i in unit:
+                mask = cand[i]
+                twice |= once & mask
+                once |= mask
+            once &= ~twice
+            while once:
+                bit = once & -once
+                once ^= bit
+                for i in unit:
+                    if cand[i] & bit:
+                        self.assign(i, bit.bit_length() - 1)
+                        placed += 1
+                        break
+        return placed
+
+    '''
+    Returns the digits that are in exactly one of some masks, and the digits in exactly two
+
+    Parameters:
+    masks is an iterable of candidate masks
+
+    Return: tuple (once mask, twice mask)
+    '''
+
+    @staticmethod
+    def count_bits(masks):
+        once = 0
+        twice = 0
+        more = 0
+        for mask in masks:
+            more |= twice & mask
+            twice |= once & mask
+            once |= mask
+        return once & ~twice, twice & ~more
+
+    '''
+    When a digit's cells in a box all lie in one row or column, it can't go anywhere else in that line
+
+    Parameters: None
+    Return: boolean (whether any candidate was removed)
+    '''
+
+    def pointing(self):
+        cand = self.cand
+        progress = False
+        for row_crossings, col_crossings in self.box_lines:
+            # eliminations only touch cells outside the box, so its lines can be read up front
+            row_masks = []
+            for inside, outside in row_crossings:
+                mask = 0
+                for i in inside:
+                    mask |= cand[i]
+                row_masks.append(mask)
+            col_masks = []
+            for inside, outside in col_crossings:
+                mask = 0
+                for i in inside:
+                    mask |= cand[i]
+                col_masks.append(mask)
+            in_one_row = self.count_bits(row_masks)[0]
+            in_one_col = self.count_bits(col_masks)[0]
+            confined = in_one_row | in_one_col
+            while confined:
+                bit = confined & -confined
+                confined ^= bit
+                if in_one_row & bit:
+                    crossings, masks = row_crossings, row_masks
+                else:
+                    crossings, masks = col_crossings, col_masks
+                outside = next(outside for (inside, outside), mask in zip(crossings, masks) if mask & bit)
+                for i in outside:
+                    if cand[i] & bit and self.eliminate(i, bit):
+                        progress = True
+        return progress
+
+    '''
+    When a digit's cells in a row or column all lie in one box, it can't go anywhere else in that box
+
+    Parameters: None
+    Return: boolean (whether any candidate was removed)
+    '''
+
+    def claiming(self):
+        cand = self.cand
+        progress = False
+        for crossings in self.line_boxes:
+            # eliminations only touch cells off the line, so its parts can be read up front
+            masks = []
+            for inside, outside in crossings:
+                mask = 0
+                for i in inside:
+                    mask |= cand[i]
+                masks.append(mask)
+            confined = self.count_bits(masks)[0]
+            while confined:
+                bit = confined & -confined
+                confined ^= bit
+                outside = next(outside for (inside, outside), mask in zip(crossings, masks) if mask & bit)
+                for i in outside:
+                    if cand[i] & bit and self.eliminate(i, bit):
+                        progress = True
+        return progress
+
+    '''
+    Two cells in a unit with the same two candidates - those digits can't go anywhere else in the unit
+
+    Parameters: None
+    Return: boolean (whether any candidate was removed)
+    '''
+
+    def naked_pair(self):
+        cand = self.cand
+        progress = False
+        for unit in self.units:
+            pairs = {}
+            for i in unit:
+                mask = cand[i]
+                if mask.bit_count() == 2:
+                    pairs.setdefault(mask, []).append(i)
+            for mask, cells in pairs.items():
+                if len(cells) != 2:
+                    continue
+                for i in unit:
+                    if i not in cells and self.eliminate(i, mask):
+                        progress = True
+        return progress
+
+    '''
+    Two digits that can only go in the same two cells of a unit - those cells can't hold anything else
+
+    Parameters: None
+    Return: boolean (whether any candidate was removed)
+    '''
+
+    def hidden_pair(self):
+        cand = self.cand
+        progress = False
+        for unit in self.units:
+            places = {}
+            twice = self.count_bits(map(cand.__getitem__, unit))[1]
+            while twice:
+                bit = twice & -twice
+                twice ^= bit
+                cells = tuple(i for i in unit if cand[i] & bit)
+                places.setdefault(cells, 0)
+                places[cells] |= bit
+            for cells, mask in places.items():
+                if mask.bit_count() != 2:
+                    continue
+                for i in cells:
+                    if self.eliminate(i, self.full_mask & ~mask):
+                        progress = True
+        return progress
+
+    '''
+    A digit that can only go in the same two columns in two different rows must use those columns
+    in those rows, so it is removed from the rest of both columns (and the same with rows and columns swapped)
+
+    Parameters: None
+    Return: boolean (whether any candidate was removed)
+    '''
+
+    def x_wing(self):
+        n = self.row_length
+        cand = self.cand
+        progress = False
+        # a cell's place in a row is its column and its place in a column is its row, so where it
+        # is in the line is also which crossing line it is on
+        for lines, crosses in ((self.rows, self.cols), (self.cols, self.rows)):
+            # the digits with two places in each line - removing one digit doesn't change the
+            # others, so this only goes stale for the digit being worked on once it removes something
+            twice = [self.count_bits(map(cand.__getitem__, line))[1] for line in lines]
+            for num in range(1, n + 1):
+                bit = 1 << num
+                seen = {}
+                changed = False
+                for line_index, line in enumerate(lines):
+                    if not changed and not twice[line_index] & bit:
+                        continue
+                    places = tuple(k for k, i in enumerate(line) if cand[i] & bit)
+                    if len(places) != 2:
+                        continue
+                    if places not in seen:
+                        seen[places] = line_index
+                        continue
+                    first = seen[places]
+                    for cross in places:
+                        for other, i in enumerate(crosses[cross]):
+                            if other != first and other != line_index and cand[i] & bit and self.eliminate(i, bit):
+                                progress = changed = True
+        return progress
+
+    '''
+    Solves as far as the technique pipeline can and grades the result
+
+    Parameters:
+    board is a 2D list of ints (0 for empty)
+
+    Return: Grade
+    '''
+
+    def grade(self, board):
+        n = self.row_length
+        techniques = {}
+        score = 0.0
+        hardest = None
+        hardest_rating = 0.0
+        if self.load(board):
+            while 0 in self.values and not self.broken:
+                if self.naked_single():
+                    name, rating, count = "Naked Single", 2.3, 1
+                else:
+                    count = self.hidden_single()
+                    name, rating = "Hidden Single", 1.5
+                    if not count:
+                        for name, rating, method in self.pipeline:
+                            if method():
+                                count = 1
+                                break
+                        else:
+                            break  # nothing in the pipeline helps
+                techniques[name] = techniques.get(name, 0) + count
+                score += rating * count
+                if rating > hardest_rating:
+                    hardest, hardest_rating = name, rating
+
+        solved = 0 not in self.values and not self.broken
+        if not solved:
+            level = EXPERT
+        elif hardest_rating >= self.hard_rating:
+            level = HARD
+        elif hardest_rating >= self.medium_rating:
+            level = MEDIUM
+        else:
+            level = EASY
+        result = [list(self.values[start:start + n]) for start in range(0, n * n, n)]
+        return Grade(level, round(score, 1), hardest, techniques, solved, result)
+
+
+'''
+Whether a grade is good enough for a menu difficulty
+Puzzles the techniques can't finish count as HARD, since the menu has no Expert button
+
+Parameters:
+grade is a Grade from grade()
+level is EASY, MEDIUM or HARD
+
+Return: boolean
+'''
+
+
+def meets_level(grade, level):
+    if level == HARD:
+        return grade.level >= HARD
+    return grade.level == level
+
+
+_local = threading.local()  # a grader keeps the board it is working on, so each thread gets its own
+
+'''
+Returns this thread's Grader for a board size, building it the first time it is asked for
+
+Parameters:
+row_length is the number of rows/columns of the board
+
+Return: Grader
+'''
+
+
+def get_grader(row_length=9):
+    graders = _local.__dict__.setdefault("graders", {})
+    grader = graders.get(row_length)
+    if grader is None:
+        grader = graders[row_length] = Grader(row_length)
+    return grader
+
+
+def grade(board):
+    return get_grader(len(board)).grade(board)
@@ -0,0 +1,264 @@
+from collections import OrderedDict, namedtuple
+
+from sudoku_core import grader
+
+"""
+Finds the easiest next step for the board a player is filling in
+Candidates are kept up to date one move at a time - each call only looks at the cells that changed
+since the last one, and placing or clearing a digit only touches that cell's peers
+Singles are looked for first, then the grader's elimination techniques are tried in the same order
+the grader uses until one of them leaves a single behind
+What the techniques eliminate is kept for the next call - filling in more cells never makes an
+elimination wrong, so they are only thrown away when a cell is cleared or changed
+
+"""
+
+Hint = namedtuple("Hint", "row col digit technique")
+Hint.__doc__ = '''
+    row and col are the cell to fill in
+    digit is the number that goes there
+    technique is the name of the hardest technique needed to see it - "Mistake" when the cell
+    already holds a wrong number, "Solution" when no technique finds anything
+'''
+
+
+class HintEngine:
+    '''
+    Sets up candidates for a puzzle
+
+    Parameters:
+    board_original is the puzzle as it was given (2D list, 0 for empty)
+    solution is the solved board (2D list), used to point out mistakes (None to only use logic)
+    max_entries is the most hints remembered, least recently used first out
+
+    Return:
+    None
+    '''
+
+    def __init__(self, board_original, solution=None, max_entries=256):
+        n = len(board_original)
+        self.row_length = n
+        self.grader = grader.get_grader(n)
+        self.full_mask = self.grader.full_mask
+        self.peers = self.grader.peers
+        # the three units of every cell - its row, then column, then box
+        self.cell_units = [(i // n, n + i % n, 2 * n + self.grader.cell_box[i]) for i in range(n * n)]
+        self.hint_units = self.grader.boxes + self.grader.rows + self.grader.cols  # boxes are the easiest to spot
+        self.solution = [value for board_row in solution for value in board_row] if solution is not None else None
+        self.counts = [[0] * (n + 1) for i in range(3 * n)]  # how many times each digit is in each unit
+        self.used = [0] * (3 * n)  # bitmask of the digits in each unit
+        self.wrong = set()  # cells holding a number that doesn't match the solution
+        self.eliminated = None  # candidates the techniques have ruled out so far, per cell
+        self.eliminated_by = (None, 0.0)  # the hardest technique behind them, and its rating
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (values, marks) -> Hint, most recently used last
+        self.hits = 0
+        self.misses = 0
+        self._load(board_original)
+
+    '''
+    Sets up the candidates for a whole board in one pass - cheaper than placing the givens one by one
+
+    Parameters:
+    board is the board (2D list, 0 for empty)
+
+    Return: None
+    '''
+
+    def _load(self, board):
+        self.values = [value for board_row in board for value in board_row]
+        for i, value in enumerate(self.values):
+            if value:
+                for unit in self.cell_units[i]:
+                    self.counts[unit][value] += 1
+                    self.used[unit] |= 1 << value
+                if self.solution is not None and value != self.solution[i]:
+                    self.wrong.add(i)
+        used = self.used
+        self.cand = [0 if value else self.full_mask & ~(used[row] | used[col] | used[box])
+                     for value, (row, col, box) in zip(self.values, self.cell_units)]
+
+    '''
+    Puts value in cell i and recomputes the candidates of the cell and its peers
+
+    Parameters:
+    i is the flat cell index (row * row_length + col)
+    value is the digit to place (0 to clear the cell)
+
+    Return: None
+    '''
+
+    def _set(self, i, value):
+        old = self.values[i]
+        if old:
+            self.eliminated = None  # they may depend on the number that was here
+        for unit in self.cell_units[i]:
+            counts = self.counts[unit]
+            if old:
+                counts[old] -= 1
+                if not counts[old]:
+                    self.used[unit] &= ~(1 << old)
+            if value:
+                counts[value] += 1
+                self.used[unit] |= 1 << value
+        self.values[i] = value
+        if self.solution is not None:
+            if value and value != self.solution[i]:
+                self.wrong.add(i)
+            else:
+                self.wrong.discard(i)
+        values = self.values
+        used = self.used
+        cand = self.cand
+        for j in (i,) + self.peers[i]:
+            if values[j]:
+                cand[j] = 0
+            else:
+                row, col, box = self.cell_units[j]
+                cand[j] = self.full_mask & ~(used[row] | used[col] | used[box])
+
+    '''
+    Catches the candidates up with the board - only the cells that changed are touched
+
+    Parameters:
+    board is the board as it is now (2D list)
+
+    Return: None
+    '''
+
+    def update(self, board):
+        n = self.row_length
+        values = self.values
+        for row in range(n):
+            board_row = board[row]
+            start = row * n
+            if values[start:start + n] == board_row:
+                continue
+            for col in range(n):
+                if values[start + col] != board_row[col]:
+                    self._set(start + col, board_row[col])
+
+    '''
+    Looks for a hidden single (in boxes, then rows, then columns) and then a naked single
+    A digit the player has already sketched in its cell is preferred over an equally easy one
+
+    Parameters:
+    cand is the list of candidate masks to look in
+    marks is the pencil mark masks (None to ignore them)
+
+    Return: Hint, or None if there are no singles
+    '''
+
+    def _single(self, cand, marks):
+        n = self.row_length
+        found = None
+        for unit in self.hint_units:
+            once = 0
+            twice = 0
+            for i in unit:
+                mask = cand[i]
+                twice |= once & mask
+                once |= mask
+            once &= ~twice
+            while once:
+                bit = once & -once
+                once ^= bit
+                for i in unit:
+                    if cand[i] & bit:
+                        if marks is None or marks[i] & bit:
+                            return Hint(i // n, i % n, bit.bit_length() - 1, "Hidden Single")
+                        if found is None:
+                            found = Hint(i // n, i % n, bit.bit_length() - 1, "Hidden Single")
+                        break
+        if found is not None:
+            return found
+        for i, mask in enumerate(cand):
+            if mask and mask & (mask - 1) == 0:
+                if marks is None or marks[i] & mask:
+                    return Hint(i // n, i % n, mask.bit_length() - 1, "Naked Single")
+                if found is None:
+                    found = Hint(i // n, i % n, mask.bit_length() - 1, "Naked Single")
+        return found
+
+    '''
+    Works out the hint for the current candidates (update() has already been called)
+    The techniques start from the eliminations kept from earlier calls, so each call only has to
+    find what the last move made possible
+
+    Parameters:
+    marks is the pencil mark masks (None to ignore them)
+
+    Return: Hint, or None if the board is full
+    '''
+
+    def _find(self, marks):
+        n = self.row_length
+        if self.wrong:
+            i = min(self.wrong)
+            return Hint(i // n, i % n, self.solution[i], "Mistake")
+        # filled cells have no candidates, so any other cell without one means a dead end
+        broken = self.cand.count(0) > n * n - self.values.count(0)
+        if not broken:
+            hint = self._single(self.cand, marks)
+            if hint is not None:
+                return hint
+
+            # nothing simple left, so run the grader's eliminations on a copy until a single shows up
+            solver = self.grader
+            solver.values = list(self.values)
+            if self.eliminated is None:
+                solver.cand = list(self.cand)
+                hardest, hardest_rating = None, 0.0
+            else:
+                solver.cand = [mask & ~eliminated for mask, eliminated in zip(self.cand, self.eliminated)]
+                hardest, hardest_rating = self.eliminated_by
+            solver.singles = []
+            solver.broken = False
+            hint = self._single(solver.cand, marks) if hardest is not None else None
+            while hint is None and not solver.broken:
+                for name, rating, method in solver.pipeline:
+                    if method():
+                        break
+                else:
+                    break  # nothing in the pipeline helps
+                if rating > hardest_rating:
+                    hardest, hardest_rating = name, rating
+                hint = self._single(solver.cand, marks)
+            if not solver.broken:
+                self.eliminated = [mask & ~left for mask, left in zip(self.cand, solver.cand)]
+                self.eliminated_by = (hardest, hardest_rating)
+            if hint is not None:
+                return hint._replace(technique=hardest)
+
+        if self.solution is not None:
+            for i, value in enumerate(self.values):
+                if not value:
+                    return Hint(i // n, i % n, self.solution[i], "Solution")
+        return None
+
+    '''
+    Returns the easiest next step for the board
+    Answers are remembered by board and pencil marks, so asking again without a move is free
+
+    Parameters:
+    board is the board as it is now (2D list)
+    sketched_values is the player's PencilMarks (None to ignore them)
+
+    Return: Hint, or None if there is nothing left to fill in
+    '''
+
+    def hint(self, board, sketched_values=None):
+        self.update(board)
+        marks = sketched_values.marks if sketched_values is not None else None
+        key = (bytes(self.values), marks.tobytes() if marks is not None else b"")
+        entries = self.entries
+        if key in entries:
+            self.hits += 1
+            entries.move_to_end(key)
+            return entries[key]
+        self.misses += 1
+        hint = self._find(marks)
+        entries[key] = hint
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return hint
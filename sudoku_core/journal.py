@@ -0,0 +1,363 @@
+import os
+import struct
+import threading
+import zlib
+from array import array
+
+from sudoku_core.game_logic import (COMMIT, ERASE, HINT, MOVE, NEXT_EMPTY, NOTES, REDO, RESET, SELECT, SKETCH,
+                                    UNDO, GameLogic)
+from sudoku_core.generator import SudokuGenerator
+from sudoku_core.puzzle_bank import pack_board, unpack_board
+
+"""
+Append-only journal of a game, so a game can be picked up again after the window closes or the
+power goes
+
+The journal is the puzzle followed by every GameLogic event, two bytes each. Events are buffered
+and written (and fsynced) in batches by a background thread, so a key press never waits on the
+disk. Resuming replays the events into a fresh GameLogic - the game logic is deterministic, so
+that rebuilds exactly the same board, sketches, selection and undo history. A hint isn't
+journaled as HINT but as the SELECT and SKETCH it turned into (see GameLogic.hint), since what a
+hint picks depends on hint engine state that snapshots don't keep. HINT still decodes, for
+journals written before that
+
+Every snapshot_every events the whole state is saved to a snapshot file next to the journal,
+together with how far into the journal it goes, so resuming only replays the events after the
+last snapshot. The snapshot is written to a temporary file and renamed over the old one, so a
+crash leaves either the old snapshot or the new one
+
+Layout (all little endian):
+    journal     header (magic, version, row_length, auto_notes and wrap the game started with),
+                givens and solution as nibbles (see
+                puzzle_bank.pack_board), then events of (kind, argument) bytes
+    snapshot    header (magic, version, row_length, journal offset, CRC32 of the puzzle), then the
+                board, pencil marks, last sketched digits, selected cell, auto-notes, the undo and
+                redo stacks, and a CRC32 of everything before it
+
+A crash can lose the events of the last unflushed batch and leave half an event at the end, which
+resume() drops. Journals are for boards up to 9x9, like puzzle banks
+
+"""
+
+MAGIC = b"SDKJ"
+SNAPSHOT_MAGIC = b"SDKS"
+VERSION = 1
+HEADER = struct.Struct("<4sHHBB")
+SNAPSHOT_HEADER = struct.Struct("<4sHHQI")
+EVENTS = (SELECT, MOVE, NEXT_EMPTY, SKETCH, ERASE, COMMIT, NOTES, UNDO, REDO, RESET, HINT)
+EVENT_CODES = {kind: code for code, kind in enumerate(EVENTS)}
+DIRECTIONS = ("up", "down", "left", "right")
+NO_CELL = 255  # SELECT None, and no selected cell in a snapshot
+
+
+def encode_event(kind, argument, row_length=9):
+    if kind == SELECT:
+        argument = NO_CELL if argument is None else argument[0] * row_length + argument[1]
+    elif kind == MOVE:
+        argument = DIRECTIONS.index(argument)
+    elif kind != SKETCH:
+        argument = 0
+    return bytes((EVENT_CODES[kind], argument))
+
+
+def decode_event(code, argument, row_length=9):
+    kind = EVENTS[code]
+    if kind == SELECT:
+        if argument == NO_CELL:
+            return kind, None
+        if argument >= row_length * row_length:
+            raise ValueError(f"no cell {argument} on a {row_length}x{row_length} board")
+        return kind, [argument // row_length, argument % row_length]
+    if kind == MOVE:
+        return kind, DIRECTIONS[argument]
+    if kind == SKETCH:
+        if not 1 <= argument <= row_length:
+            raise ValueError(f"can't sketch {argument} on a {row_length}x{row_length} board")
+        return kind, argument
+    return kind, None
+
+
+def puzzle_checksum(sudoku):
+    return zlib.crc32(pack_board(sudoku.board_original) + pack_board(sudoku.board_correct))
+
+
+'''
+Packs everything about a game that events change into bytes
+
+Parameters:
+logic is the GameLogic
+offset is how many bytes of the journal the state includes
+
+Return: bytes
+'''
+
+
+def pack_snapshot(logic, offset):
+    n = logic.model.row_length
+    selected = logic.selected_cord
+    data = bytearray(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, VERSION, n, offset, puzzle_checksum(logic.sudoku)))
+    data += bytes(value for board_row in logic.board for value in board_row)
+    data += struct.pack(f"<{n * n}H", *logic.sketched_values.marks)
+    data += logic.sketched_values.recent.tobytes()
+    data += bytes((NO_CELL if selected is None else selected[0] * n + selected[1], logic.auto_notes))
+    for stack in (logic.history.done, logic.history.undone):
+        data += struct.pack("<I", len(stack))
+        for deltas in stack:
+            data += struct.pack(f"<I{len(deltas)}I", len(deltas), *deltas)
+    data += struct.pack("<I", zlib.crc32(data))
+    return bytes(data)
+
+
+'''
+Puts a game back into the state a snapshot was taken in
+
+Parameters:
+logic is a GameLogic for the same puzzle, as it was started
+data is the bytes from pack_snapshot
+
+Return: int (the journal offset the snapshot goes up to)
+'''
+
+
+def unpack_snapshot(logic, data):
+    if len(data) < SNAPSHOT_HEADER.size + 4 or zlib.crc32(data[:-4]) != struct.unpack_from("<I", data, len(data) - 4)[0]:
+        raise ValueError("damaged snapshot")
+    magic, version, n, offset, checksum = SNAPSHOT_HEADER.unpack_from(data)
+    if (magic != SNAPSHOT_MAGIC or version != VERSION or n != logic.model.row_length
+            or checksum != puzzle_checksum(logic.sudoku)):
+        raise ValueError("not a snapshot of this game")
+    position = SNAPSHOT_HEADER.size
+    cells = data[position:position + n * n]
+    position += n * n
+    for i, value in enumerate(cells):
+        row, col = divmod(i, n)
+        logic.model.set(row, col, value)
+        logic.nav.update(row, col, value)
+    logic.sketched_values.marks[:] = array("L", struct.unpack_from(f"<{n * n}H", data, position))
+    position += 2 * n * n
+    logic.sketched_values.recent[:] = array("B", data[position:position + n * n])
+    position += n * n
+    selected, logic.auto_notes = data[position], bool(data[position + 1])
+    logic.selected_cord = None if selected == NO_CELL else [selected // n, selected % n]
+    position += 2
+    for stack in (logic.history.done, logic.history.undone):
+        stack.clear()
+        (moves,) = struct.unpack_from("<I", data, position)
+        position += 4
+        for i in range(moves):
+            (length,) = struct.unpack_from("<I", data, position)
+            stack.append(array("L", struct.unpack_from(f"<{length}I", data, position + 4)))
+            position += 4 + 4 * length
+    logic.check_board()
+    return offset
+
+
+class Journal:
+    '''
+    Starts journaling a game - pass the journal to GameLogic as its trace, or use Journal.start()
+
+    Parameters:
+    path is the journal file (the snapshot is path + ".snapshot")
+    logic is the GameLogic being journaled (set it before the first event if it isn't known yet)
+    offset is how many bytes the journal file already has (0 for a new journal)
+    snapshot_every is how many events go between snapshots
+    flush_interval is the most seconds an event waits in memory before it is written
+
+    Return:
+    None
+    '''
+
+    def __init__(self, path, logic=None, offset=0, snapshot_every=500, flush_interval=0.25):
+        self.path = path
+        self.snapshot_path = path + ".snapshot"
+        self.logic = logic
+        self.offset = offset  # bytes written to the journal so far, including the ones still buffered
+        self.snapshot_every = snapshot_every
+        self.flush_interval = flush_interval
+        self.since_snapshot = 0
+        self.pending = bytearray()
+        self.snapshot_data = None  # newest snapshot waiting to be written
+        self.lock = threading.Lock()
+        self.writing = threading.Lock()  # one flush at a time, so batches reach the file in order
+        self.wake = threading.Event()
+        self.stopped = False
+        self.file = open(path, "ab")
+        self.thread = threading.Thread(target=self.flush_loop, name="journal", daemon=True)
+        self.thread.start()
+
+    '''
+    Creates a new journal for a game that is just starting (an old journal at path is replaced)
+
+    Parameters:
+    path is the journal file
+    logic is the GameLogic, before any events have been handled
+    snapshot_every and flush_interval are passed on to Journal
+
+    Return: Journal (already set as logic's trace)
+    '''
+
+    @classmethod
+    def start(cls, path, logic, **options):
+        discard(path)
+        sudoku = logic.sudoku
+        header = HEADER.pack(MAGIC, VERSION, logic.model.row_length, logic.auto_notes, logic.nav.wrap)
+        header += pack_board(sudoku.board_original) + pack_board(sudoku.board_correct)
+        journal = cls(path, logic, **options)
+        journal.write(header)
+        logic.trace = journal
+        return journal
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, data):
+        with self.lock:
+            self.pending += data
+            self.offset += len(data)
+
+    '''
+    Records one event - called by GameLogic.handle before the event is applied, so a snapshot
+    taken here is the state the event starts from
+
+    Parameters:
+    event is the (kind, argument) pair
+
+    Return: None
+    '''
+
+    def append(self, event):
+        if self.since_snapshot >= self.snapshot_every:
+            self.since_snapshot = 0
+            data = pack_snapshot(self.logic, self.offset)
+            with self.lock:
+                self.snapshot_data = data
+            self.wake.set()
+        self.since_snapshot += 1
+        self.write(encode_event(event[0], event[1], self.logic.model.row_length))
+
+    '''
+    Body of the background thread - writes whatever has been buffered every flush_interval seconds
+    The journal is fsynced before a snapshot replaces the old one, so a snapshot never goes further
+    than the journal on disk
+
+    Parameters: None
+    Return: None
+    '''
+
+    def flush_loop(self):
+        while not self.stopped:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            self.flush()
+
+    def flush(self):
+        with self.writing:
+            with self.lock:
+                data, self.pending = self.pending, bytearray()
+                snapshot, self.snapshot_data = self.snapshot_data, None
+            if data and not self.file.closed:
+                self.file.write(data)
+                self.file.flush()
+                os.fsync(self.file.fileno())
+            if snapshot is not None:
+                temporary = self.snapshot_path + ".tmp"
+                with open(temporary, "wb") as file:
+                    file.write(snapshot)
+                    file.flush()
+                    os.fsync(file.fileno())
+                os.replace(temporary, self.snapshot_path)
+
+    '''
+    Writes everything still buffered and stops the background thread
+    The journal stays on disk so the game can be resumed
+
+    Parameters: None
+    Return: None
+    '''
+
+    def close(self):
+        if self.stopped:
+            return
+        self.stopped = True
+        self.wake.set()
+        self.thread.join()
+        self.flush()
+        self.file.close()
+
+
+'''
+Deletes a journal and its snapshot, e.g. once the game is over
+
+Parameters:
+path is the journal file
+
+Return: None
+'''
+
+
+def discard(path):
+    for name in (path, path + ".snapshot", path + ".snapshot.tmp"):
+        if os.path.exists(name):
+            os.remove(name)
+
+
+'''
+Rebuilds a game from its journal - from the last snapshot if there is a good one, then by
+replaying the events after it - and carries on journaling it
+
+Parameters:
+path is the journal file
+snapshot_every and flush_interval are passed on to Journal
+
+Return: GameLogic with a Journal as its trace, or None if there is no journal or it is unreadable
+'''
+
+
+def resume(path, **options):
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, version, n, auto_notes, wrap = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            return None
+        board_bytes = (n * n + 1) // 2
+        start = HEADER.size + 2 * board_bytes
+        if len(data) < start:
+            return None
+        givens = unpack_board(data[HEADER.size:HEADER.size + board_bytes], n)
+        solution = unpack_board(data[HEADER.size + board_bytes:start], n)
+    except (OSError, struct.error):
+        return None
+
+    def new_game():
+        return GameLogic(SudokuGenerator.from_boards(givens, solution), auto_notes=bool(auto_notes), wrap=bool(wrap))
+
+    logic = new_game()
+    end = start + (len(data) - start) // 2 * 2  # drop half an event left by a crash
+    position = start
+    try:
+        with open(path + ".snapshot", "rb") as file:
+            offset = unpack_snapshot(logic, file.read())
+        if not start <= offset <= end:
+            raise ValueError("the snapshot goes past the end of the journal")
+        position = offset
+    except (OSError, ValueError, struct.error):
+        logic = new_game()  # no snapshot to start from, so replay the whole journal
+
+    handle = logic.handle
+    try:
+        for i in range(position, end, 2):
+            kind, argument = decode_event(data[i], data[i + 1], n)
+            handle(kind, argument)
+    except (IndexError, ValueError):
+        end = i  # garbage from a torn write - keep everything before it
+
+    if end < len(data):
+        with open(path, "r+b") as file:
+            file.truncate(end)
+    logic.trace = Journal(path, logic, offset=end, **options)
+    logic.trace.since_snapshot = (end - position) // 2
+    return logic
@@ -0,0 +1,169 @@
+"""
+Keyboard navigation between the cells a player can edit
+The nearest editable cell in each direction is worked out once per puzzle from board_original,
+so an arrow key is a single list lookup. Empty cells are tracked as a bitmask (bit i for flat
+cell index i) that is updated as cells are filled, so "jump to the next empty cell" is a couple
+of integer operations
+
+"""
+
+DIRECTIONS = ("up", "down", "left", "right")
+
+
+class NavigationIndex:
+    '''
+    Builds the lookup tables for a puzzle
+
+    Parameters:
+    board_original is the puzzle as it was given (2D list, 0 for cells the player can edit)
+    wrap is True to wrap around to the other end of the row/column (or board) instead of stopping
+
+    Return:
+    None
+    '''
+
+    def __init__(self, board_original, wrap=False):
+        n = len(board_original)
+        self.row_length = n
+        self.wrap = wrap
+        self.editable = [board_original[row][col] == 0 for row in range(n) for col in range(n)]
+        self.editable_mask = 0
+        for i, editable in enumerate(self.editable):
+            if editable:
+                self.editable_mask |= 1 << i
+        self.empty_mask = self.editable_mask
+
+        rows = [[row * n + col for col in range(n)] for row in range(n)]
+        cols = [[row * n + col for row in range(n)] for col in range(n)]
+        self.nearest = {direction: [-1] * (n * n) for direction in DIRECTIONS}
+        for line in rows:
+            self._fill_line(self.nearest["right"], line)
+            self._fill_line(self.nearest["left"], line[::-1])
+        for line in cols:
+            self._fill_line(self.nearest["down"], line)
+            self._fill_line(self.nearest["up"], line[::-1])
+
+    '''
+    For every cell in a line, stores the next editable cell after it in that line
+
+    Parameters:
+    table is the nearest list for one direction
+    line is the flat cell indexes in the order of travel
+
+    Return: None
+    '''
+
+    def _fill_line(self, table, line):
+        following = -1
+        for i in reversed(line):
+            table[i] = following
+            if self.editable[i]:
+                following = i
+        if self.wrap and following != -1:  # following is now the first editable cell in the line
+            for i in line:
+                if table[i] == -1 and i != following:
+                    table[i] = following
+
+    '''
+    Returns the nearest editable cell from current_cord in a direction
+
+    Parameters:
+    current_cord is [row, col]
+    direction is "up", "down", "left" or "right"
+
+    Return: [row, col] or None if there isn't one
+    '''
+
+    def move(self, current_cord, direction):
+        i = self.nearest[direction][current_cord[0] * self.row_length + current_cord[1]]
+        if i == -1:
+            return None
+        return list(divmod(i, self.row_length))
+
+    '''
+    Returns the next empty editable cell after current_cord in reading order
+
+    Parameters:
+    current_cord is [row, col] (None to start from the top left)
+
+    Return: [row, col] or None if there isn't one
+    '''
+
+    def next_empty(self, current_cord=None):
+        start = 0 if current_cord is None else current_cord[0] * self.row_length + current_cord[1] + 1
+        later = self.empty_mask >> start
+        if later:
+            i = start + (later & -later).bit_length() - 1
+        elif self.wrap and self.empty_mask:
+            i = (self.empty_mask & -self.empty_mask).bit_length() - 1
+        else:
+            return None
+        return list(divmod(i, self.row_length))
+
+    '''
+    Records that a cell was filled in or cleared
+
+    Parameters:
+    row and col are the cell
+    value is its new value (0 for empty)
+
+    Return: None
+    '''
+
+    def update(self, row, col, value):
+        i = row * self.row_length + col
+        if not self.editable[i]:
+            return
+        if value:
+            self.empty_mask &= ~(1 << i)
+        else:
+            self.empty_mask |= 1 << i
+
+    '''
+    Marks every editable cell as empty again (after the board is reset)
+
+    Parameters: None
+    Return: None
+    '''
+
+    def reset(self):
+        self.empty_mask = self.editable_mask
+
+
+#from litzyriveroo
+'''
+Finds the nearest cell the player can edit from current_cord in a direction
+Cells the player has already filled in can still be moved to, only the original givens are skipped
+
+Parameters:
+current_cord is [row, col]
+direction is "up", "down", "left" or "right"
+sudoku_instance is the SudokuGenerator for the puzzle
+nav is the puzzle's NavigationIndex (None to scan board_original instead)
+
+Return: [row, col] or None if there isn't one
+'''
+
+
+def find_next_vacant_box(current_cord, direction, sudoku_instance, nav=None):
+    if nav is not None:
+        return nav.move(current_cord, direction)
+    row, col = current_cord
+    size = len(sudoku_instance.board_original)
+    if direction == "up":
+        for r in range(row - 1, -1, -1):
+            if sudoku_instance.board_original[r][col] == 0:
+                return [r, col]
+    elif direction == "down":
+        for r in range(row + 1, size):
+            if sudoku_instance.board_original[r][col] == 0:
+                return [r, col]
+    elif direction == "left":
+        for c in range(col - 1, -1, -1):
+            if sudoku_instance.board_original[row][c] == 0:
+                return [row, c]
+    elif direction == "right":
+        for c in range(col + 1, size):
+            if sudoku_instance.board_original[row][c] == 0:
+                return [row, c]
+    return None  # If no vacant cell is found in that direction
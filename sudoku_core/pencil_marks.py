@@ -0,0 +1,154 @@
+from array import array
+
+"""
+Pencil marks (sketched values) stored as one bitmask per cell in a flat array
+Bit n of a cell's mask is set when n is sketched in that cell
+
+"""
+
+_peers = {}
+
+'''
+Returns the peer table for a board size - for every flat cell index, the indexes of the other
+cells in its row, column and box. Built once per size
+
+Parameters:
+row_length is the number of rows/columns of the board
+
+Return: list of tuples
+'''
+
+
+def get_peers(row_length):
+    peers = _peers.get(row_length)
+    if peers is None:
+        box = int(row_length ** 0.5)
+        peers = []
+        for i in range(row_length * row_length):
+            row, col = divmod(i, row_length)
+            box_row = row - row % box
+            box_col = col - col % box
+            cells = {row * row_length + c for c in range(row_length)}
+            cells |= {r * row_length + col for r in range(row_length)}
+            cells |= {(box_row + r) * row_length + box_col + c for r in range(box) for c in range(box)}
+            cells.discard(i)
+            peers.append(tuple(sorted(cells)))
+        _peers[row_length] = peers
+    return peers
+
+
+class PencilMarks:
+    '''
+    Sets up empty marks for every cell
+
+    Parameters:
+    row_length is the number of rows/columns of the board
+
+    Return:
+    None
+    '''
+
+    def __init__(self, row_length=9):
+        self.row_length = row_length
+        self.marks = array("L", [0]) * (row_length * row_length)
+        self.recent = array("B", [0]) * (row_length * row_length)  # last digit sketched in each cell
+        self.peers = get_peers(row_length)
+
+    '''
+    Yields each row as lists of sketched digits, so the marks print like the old nested lists
+
+    Parameters: None
+    Return: generator of list[list]
+    '''
+
+    def __iter__(self):
+        for row in range(self.row_length):
+            yield [self.digits(row, col) for col in range(self.row_length)]
+
+    def mask(self, row, col):
+        return self.marks[row * self.row_length + col]
+
+    def has(self, row, col, digit):
+        return (self.marks[row * self.row_length + col] >> digit) & 1 == 1
+
+    '''
+    Returns the sketched digits of a cell, smallest first
+
+    Parameters:
+    row and col are the cell
+
+    Return: list of ints
+    '''
+
+    def digits(self, row, col):
+        mask = self.marks[row * self.row_length + col]
+        found = []
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            found.append(bit.bit_length() - 1)
+        return found
+
+    '''
+    Sketches digit in the cell, or rubs it out if it was already there
+
+    Parameters:
+    row and col are the cell
+    digit is the number to toggle
+
+    Return: boolean (whether the digit is sketched now)
+    '''
+
+    def toggle(self, row, col, digit):
+        i = row * self.row_length + col
+        self.marks[i] ^= 1 << digit
+        if (self.marks[i] >> digit) & 1:
+            self.recent[i] = digit
+            return True
+        return False
+
+    '''
+    Returns the digit Enter should commit - the last one sketched if it is still there,
+    otherwise the largest one left
+
+    Parameters:
+    row and col are the cell
+
+    Return: int (0 if the cell has no marks)
+    '''
+
+    def last(self, row, col):
+        i = row * self.row_length + col
+        mask = self.marks[i]
+        digit = self.recent[i]
+        if digit and (mask >> digit) & 1:
+            return digit
+        return mask.bit_length() - 1 if mask else 0
+
+    def remove_last(self, row, col):
+        digit = self.last(row, col)
+        if digit:
+            self.marks[row * self.row_length + col] &= ~(1 << digit)
+
+    def clear(self, row, col):
+        self.marks[row * self.row_length + col] = 0
+
+    def clear_all(self):
+        self.marks[:] = array("L", [0]) * len(self.marks)
+        self.recent[:] = array("B", [0]) * len(self.recent)
+
+    '''
+    Rubs digit out of every cell in the same row, column and box (auto-notes after a value is committed)
+
+    Parameters:
+    row and col are the cell the digit was placed in
+    digit is the number that was placed
+
+    Return: None
+    '''
+
+    def eliminate(self, row, col, digit):
+        marks = self.marks
+        keep = ~(1 << digit)
+        for i in self.peers[row * self.row_length + col]:
+            marks[i] &= keep
@@ -0,0 +1,141 @@
+import contextlib
+import functools
+import importlib
+import time
+
+"""
+Optional call counting and timing for the hot functions
+enable() swaps each hooked function for a wrapper that counts calls and adds up the time spent
+in it, and disable() puts the original back. Nothing is checked while the hooks are off, so they
+cost nothing until they are turned on
+
+Times are inclusive and only the outermost call of a recursive function is timed, so
+fill_remaining's time is the whole search rather than every level added together
+Counts are kept without locks - good enough for profiling, not exact if several threads call the
+same hooked function at once
+
+"""
+
+# "module:Class.attribute" or "module:function" for every function enable() hooks by default
+HOOKS = (
+    "sudoku_core.generator:SudokuGenerator.__init__",
+    "sudoku_core.generator:SudokuGenerator.fill_solution",
+    "sudoku_core.generator:SudokuGenerator.fill_remaining",
+    "sudoku_core.generator:SudokuGenerator.fill_remaining_mrv",
+    "sudoku_core.generator:SudokuGenerator.remove_cells",
+    "sudoku_core.generator:SudokuGenerator.count_solutions",
+    "sudoku_core.generator:SudokuGenerator.is_valid",
+    "sudoku_core.generator:SudokuGenerator.place",
+    "sudoku_core.generator:SudokuGenerator.unplace",
+    "sudoku_core.grader:Grader.grade",
+    "sudoku_core.solver:DLXSolver.search",
+)
+
+_originals = {}  # hook name -> (owner, attribute, original function) while it is hooked
+counts = {}  # hook name -> [calls, seconds, depth]
+
+
+def _resolve(name):
+    module_name, path = name.split(":")
+    owner = importlib.import_module(module_name)
+    *parents, attribute = path.split(".")
+    for parent in parents:
+        owner = getattr(owner, parent)
+    return owner, attribute
+
+
+def _wrap(name, function):
+    stats = counts.setdefault(name, [0, 0.0, 0])
+
+    @functools.wraps(function)
+    def hook(*args, **kwargs):
+        stats[0] += 1
+        if stats[2]:  # a recursive call, already inside the timed outer call
+            return function(*args, **kwargs)
+        stats[2] = 1
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats[1] += time.perf_counter() - start
+            stats[2] = 0
+
+    return hook
+
+
+'''
+Turns the hooks on
+
+Parameters:
+names is the functions to hook, as "module:Class.attribute" strings (None for HOOKS)
+
+Return: None
+'''
+
+
+def enable(names=None):
+    for name in (HOOKS if names is None else names):
+        if name in _originals:
+            continue
+        owner, attribute = _resolve(name)
+        original = vars(owner)[attribute]
+        _originals[name] = (owner, attribute, original)
+        setattr(owner, attribute, _wrap(name, original))
+
+
+def disable():
+    for owner, attribute, original in _originals.values():
+        setattr(owner, attribute, original)
+    _originals.clear()
+
+
+def is_enabled():
+    return bool(_originals)
+
+
+def reset():
+    for stats in counts.values():
+        stats[0] = 0
+        stats[1] = 0.0
+
+
+'''
+Returns what the hooks have counted so far, most time first
+
+Parameters: None
+Return: list of (name, calls, seconds) tuples
+'''
+
+
+def report():
+    rows = [(name, stats[0], stats[1]) for name, stats in counts.items() if stats[0]]
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows
+
+
+def format_report():
+    lines = ["profile:"]
+    for name, calls, seconds in report():
+        lines.append(f"  {name.split(':')[1]:<40} {calls:10d} calls {seconds * 1000:10.1f} ms "
+                     f"{seconds / calls * 1e6:9.1f} us/call")
+    return "\n".join(lines)
+
+
+'''
+Turns the hooks on for the length of a with block, and puts everything back afterwards
+
+Parameters:
+names is the functions to hook (None for HOOKS)
+
+Return: context manager
+'''
+
+
+@contextlib.contextmanager
+def profiled(names=None):
+    reset()
+    enable(names)
+    try:
+        yield
+    finally:
+        disable()
@@ -0,0 +1,257 @@
+import mmap
+import random
+import struct
+import sys
+from array import array
+
+from sudoku_core import grader
+
+"""
+Puzzle bank file format - a flat file of fixed-size puzzle records with an index by difficulty
+
+Layout (all little endian):
+    header      32 bytes   magic, version, row_length, record size, record count, index offset
+    records     count * record_size bytes
+        givens      one 4-bit nibble per cell, 0 for an empty cell
+        solution    one 4-bit nibble per cell
+        difficulty  1 byte
+        seed        8 bytes
+    index       256 entries of (offset, count), one per difficulty level, followed by
+                arrays of 4-byte record numbers for each level
+
+Nibbles only hold 0-15, so banks are for boards up to 9x9
+
+"""
+
+MAGIC = b"SDKB"
+VERSION = 1
+HEADER = struct.Struct("<4sHBxHxxIQ8x")
+INDEX_ENTRY = struct.Struct("<QI")
+LEVELS = 256
+
+
+'''
+Packs a 2D board into bytes with one nibble per cell, first cell in the high nibble
+
+Parameters:
+board is a 2D list of ints (0-15)
+
+Return: bytes
+'''
+
+
+def pack_board(board):
+    digits = "".join("%x" % value for board_row in board for value in board_row)
+    if len(digits) % 2:
+        digits += "0"
+    return bytes.fromhex(digits)
+
+
+'''
+Unpacks bytes made by pack_board back into a 2D board
+
+Parameters:
+data is the packed bytes
+row_length is the number of rows/columns of the board
+
+Return: list[list]
+'''
+
+
+def unpack_board(data, row_length):
+    digits = data.hex()
+    return [[int(digits[i], 16) for i in range(start, start + row_length)]
+            for start in range(0, row_length * row_length, row_length)]
+
+
+'''
+Writes puzzles to a bank file one record at a time
+Records go straight to disk, only the per-difficulty index is kept in memory until close()
+
+Parameters:
+path is the file to create
+row_length is the number of rows/columns of the boards (at most 9)
+
+Return:
+None
+'''
+
+
+class PuzzleBankWriter:
+    def __init__(self, path, row_length=9):
+        if row_length > 15:
+            raise ValueError(f"puzzle banks hold boards up to 9x9, got {row_length}x{row_length}")
+        self.row_length = row_length
+        self.board_bytes = (row_length * row_length + 1) // 2
+        self.record = struct.Struct(f"<{self.board_bytes}s{self.board_bytes}sBQ")
+        self.count = 0
+        self.levels = {}
+        self.file = open(path, "wb")
+        self.file.write(bytes(HEADER.size))  # filled in by close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    '''
+    Appends one puzzle to the bank
+
+    Parameters:
+    board is the puzzle as a 2D list (0 for empty)
+    solution is the solved board as a 2D list
+    difficulty is the level to file it under (0-255)
+    seed is the seed it was generated from, if known
+
+    Return: int (the record number)
+    '''
+
+    def add(self, board, solution, difficulty, seed=0):
+        self.file.write(self.record.pack(pack_board(board), pack_board(solution), difficulty, seed))
+        self.levels.setdefault(difficulty, array("I")).append(self.count)
+        self.count += 1
+        return self.count - 1
+
+    def close(self):
+        if self.file.closed:
+            return
+        index_offset = HEADER.size + self.count * self.record.size
+        offset = index_offset + LEVELS * INDEX_ENTRY.size
+        for level in range(LEVELS):
+            records = self.levels.get(level, ())
+            self.file.write(INDEX_ENTRY.pack(offset, len(records)))
+            offset += 4 * len(records)
+        for level in range(LEVELS):
+            if level in self.levels:
+                records = self.levels[level]
+                if sys.byteorder != "little":
+                    records.byteswap()
+                records.tofile(self.file)
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, self.row_length, self.record.size, self.count, index_offset))
+        self.file.close()
+
+
+'''
+Read-only view of a bank file through mmap
+Only the records that are asked for are read, so opening a bank of millions of puzzles is instant
+
+Parameters:
+path is the bank file to open
+
+Return:
+None
+'''
+
+
+class PuzzleBank:
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            if file.seek(0, 2) < HEADER.size:  # mmap can't map an empty file, and the header wouldn't fit
+                raise ValueError(f"{path} is too short to be a puzzle bank")
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.row_length, record_size, self.count, self.index_offset = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            self.data.close()
+            raise ValueError(f"{path} is not a version {VERSION} puzzle bank")
+        self.board_bytes = (self.row_length * self.row_length + 1) // 2
+        self.record = struct.Struct(f"<{self.board_bytes}s{self.board_bytes}sBQ")
+        if self.record.size != record_size:
+            self.data.close()
+            raise ValueError(f"{path} has records of {record_size} bytes, expected {self.record.size}")
+        if len(self.data) < max(HEADER.size + self.count * record_size, self.index_offset + LEVELS * INDEX_ENTRY.size):
+            self.data.close()
+            raise ValueError(f"{path} is truncated")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self.data.close()
+
+    '''
+    Returns the puzzle stored as record n
+
+    Parameters:
+    n is the record number (0 to len(bank) - 1)
+
+    Return: tuple (board, solution, difficulty, seed)
+    '''
+
+    def get(self, n):
+        if not 0 <= n < self.count:
+            raise IndexError(f"record {n} out of range for a bank of {self.count}")
+        givens, solution, difficulty, seed = self.record.unpack_from(self.data, HEADER.size + n * self.record.size)
+        return unpack_board(givens, self.row_length), unpack_board(solution, self.row_length), difficulty, seed
+
+    __getitem__ = get
+
+    '''
+    Returns how many puzzles are filed under a difficulty level
+
+    Parameters:
+    difficulty is the level (0-255)
+
+    Return: int
+    '''
+
+    def count_at(self, difficulty):
+        return INDEX_ENTRY.unpack_from(self.data, self.index_offset + difficulty * INDEX_ENTRY.size)[1]
+
+    '''
+    Returns a random puzzle of the given difficulty
+
+    Parameters:
+    difficulty is the level (0-255)
+    rng is the random.Random (or module) to draw from
+
+    Return: tuple (board, solution, difficulty, seed)
+    '''
+
+    def random(self, difficulty, rng=random):
+        offset, count = INDEX_ENTRY.unpack_from(self.data, self.index_offset + difficulty * INDEX_ENTRY.size)
+        if count == 0:
+            raise LookupError(f"no puzzles of difficulty {difficulty} in the bank")
+        n = struct.unpack_from("<I", self.data, offset + 4 * rng.randrange(count))[0]
+        return self.get(n)
+
+
+'''
+Generates puzzles for each menu difficulty and writes them to a new bank
+Every puzzle is graded and only kept if it really is the level it gets filed under
+Each record keeps its puzzle's seed, so SudokuGenerator(9, LEVEL_REMOVED[difficulty], True, seed)
+makes it again
+
+Parameters:
+path is the file to create
+per_difficulty is the number of puzzles for each of EASY, MEDIUM and HARD
+workers is passed on to generate_many
+
+Return: None
+'''
+
+
+def build_bank(path, per_difficulty, workers=None):
+    from sudoku_core.generator import LEVEL_REMOVED, generate_many
+
+    with PuzzleBankWriter(path) as writer:
+        for difficulty in (grader.EASY, grader.MEDIUM, grader.HARD):
+            kept = 0
+            while kept < per_difficulty:
+                for chunk in generate_many(per_difficulty, LEVEL_REMOVED[difficulty], workers=workers, unique=True):
+                    for board, solution, seed in chunk:
+                        if kept < per_difficulty and grader.meets_level(grader.grade(board), difficulty):
+                            writer.add(board, solution, difficulty, seed)
+                            kept += 1
+
+
+if __name__ == "__main__":
+    # python3 -m sudoku_core.puzzle_bank puzzles.bank 1000
+    build_bank(sys.argv[1], int(sys.argv[2]))
@@ -0,0 +1,158 @@
+import dbm
+import threading
+from collections import OrderedDict
+
+from sudoku_core.board import Board
+from sudoku_core.generator import LEVEL_REMOVED, SudokuGenerator, generate_graded
+
+"""
+Remembers seeded puzzles so the same (size, difficulty, seed) is only ever generated once
+Seeded generation always gives the same puzzle, so a shared puzzle (like a daily seed) can be
+handed to every client from the cache
+Recently used puzzles are kept in memory up to a limit, least recently used first out. An optional
+dbm file behind that keeps every puzzle across restarts
+
+"""
+
+'''
+Builds the puzzle for a cache key - graded 9x9 puzzles, or for other sizes a unique puzzle with
+the same share of cells removed as a 9x9 one of that level
+
+Parameters:
+size is the number of rows/columns of the board
+difficulty is grader.EASY, MEDIUM or HARD
+seed is the seed to generate from
+
+Return: SudokuGenerator
+'''
+
+
+def seeded_sudoku(size, difficulty, seed):
+    if size == 9:
+        return generate_graded(difficulty, seed=seed)
+    return SudokuGenerator(size, LEVEL_REMOVED[difficulty] * size * size // 81, unique=True, seed=seed)
+
+
+class PuzzleCache:
+    '''
+    Sets up an empty cache
+
+    Parameters:
+    max_entries is the most puzzles to keep in memory
+    path is the dbm file for the on-disk layer (None to only keep puzzles in memory)
+    make is called as make(size, difficulty, seed) to build a puzzle that isn't cached
+
+    Return:
+    None
+    '''
+
+    def __init__(self, max_entries=256, path=None, make=seeded_sudoku):
+        self.max_entries = max_entries
+        self.make = make
+        self.entries = OrderedDict()  # key -> (puzzle Board, solution Board), most recently used last
+        self.lock = threading.Lock()
+        self.pending = {}  # key -> threading.Event for puzzles being generated right now
+        self.disk = dbm.open(path, "c") if path is not None else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def close(self):
+        if self.disk is not None:
+            self.disk.close()
+            self.disk = None
+
+    def _disk_key(self, key):
+        return "%d:%d:%d" % key
+
+    '''
+    Returns the puzzle for a key, from memory, then disk, and only generating it if neither has it
+    If several threads ask for the same missing puzzle at once, only one of them generates it
+    Every call gets its own SudokuGenerator, so playing on it doesn't change the cached puzzle
+
+    Parameters:
+    size is the number of rows/columns of the board
+    difficulty is grader.EASY, MEDIUM or HARD
+    seed is the seed to generate from
+
+    Return: SudokuGenerator
+    '''
+
+    def get(self, size, difficulty, seed):
+        key = (size, difficulty, seed)
+        while True:
+            with self.lock:
+                boards = self._lookup(key)
+                if boards is not None:
+                    return self._sudoku(boards)
+                making = self.pending.get(key)
+                if making is None:  # nobody is building this one yet, so this call does
+                    making = self.pending[key] = threading.Event()
+                    self.misses += 1
+                    break
+            making.wait()  # another thread is building the same puzzle, use theirs
+
+        try:
+            sudoku = self.make(size, difficulty, seed)  # outside the lock so other keys aren't held up
+            boards = (Board.from_lists(sudoku.board_original), Board.from_lists(sudoku.board_correct))
+            with self.lock:
+                self._remember(key, boards)
+                if self.disk is not None:
+                    self.disk[self._disk_key(key)] = self._pack(boards)
+        finally:
+            with self.lock:
+                del self.pending[key]
+            making.set()
+        return self._sudoku(boards)
+
+    def _lookup(self, key):
+        boards = self.entries.get(key)
+        if boards is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+        elif self.disk is not None and self._disk_key(key) in self.disk:
+            boards = self._unpack(self.disk[self._disk_key(key)], key[0])
+            self.disk_hits += 1
+            self._remember(key, boards)
+        return boards
+
+    def _remember(self, key, boards):
+        self.entries[key] = boards
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def _sudoku(self, boards):
+        return SudokuGenerator.from_boards(boards[0].to_lists(), boards[1].to_lists())
+
+    def _pack(self, boards):
+        return boards[0].cells + boards[1].cells
+
+    def _unpack(self, data, size):
+        cells = size * size
+        return Board(data[:cells], size), Board(data[cells:], size)
+
+    '''
+    Returns the cache counters
+
+    Parameters: None
+    Return: dict (hits, disk_hits, misses, evictions, entries and hit_rate)
+    '''
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                    "evictions": self.evictions, "entries": len(self.entries),
+                    "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0}
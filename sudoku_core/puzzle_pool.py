@@ -0,0 +1,102 @@
+import queue
+import threading
+
+"""
+Keeps a few ready-made puzzles for each difficulty so the menu never waits on generation
+A background thread tops the pools back up after puzzles are taken
+
+"""
+
+
+class PuzzlePool:
+    '''
+    Starts the background thread and begins filling every pool straight away
+
+    Parameters:
+    make is called as make(level) to build one puzzle (e.g. sudoku_core.generator.new_sudoku)
+    levels is the difficulty levels to keep puzzles for
+    depth is how many ready puzzles to keep for each level
+
+    Return:
+    None
+    '''
+
+    def __init__(self, make, levels, depth=2):
+        self.make = make
+        self.levels = tuple(levels)
+        self.depth = depth
+        self.ready = {level: queue.Queue(maxsize=depth) for level in self.levels}
+        self.wanted = threading.Event()  # set whenever a pool may need topping up
+        self.stopped = False
+        self.wanted.set()
+        self.thread = threading.Thread(target=self.fill, name="puzzle-pool", daemon=True)
+        self.thread.start()
+
+    '''
+    Body of the background thread - makes one puzzle at a time for whichever level is short,
+    then sleeps until get() takes something
+
+    Parameters: None
+    Return: None
+    '''
+
+    def fill(self):
+        while not self.stopped:
+            self.wanted.wait()
+            self.wanted.clear()
+            topped_up = False
+            while not topped_up and not self.stopped:
+                topped_up = True
+                for level in self.levels:
+                    if self.stopped:
+                        return
+                    if not self.ready[level].full():
+                        self.ready[level].put(self.make(level))
+                        topped_up = False
+
+    '''
+    Takes a puzzle for the level, building one right here only if the pool is empty
+
+    Parameters:
+    level is the difficulty level
+
+    Return: whatever make(level) returns
+    '''
+
+    def get(self, level):
+        puzzle = self.get_nowait(level)
+        if puzzle is None:
+            puzzle = self.make(level)
+        return puzzle
+
+    '''
+    Takes a puzzle for the level only if one is ready
+
+    Parameters:
+    level is the difficulty level
+
+    Return: whatever make(level) returns, or None if the pool is empty
+    '''
+
+    def get_nowait(self, level):
+        try:
+            puzzle = self.ready[level].get_nowait()
+        except queue.Empty:
+            puzzle = None
+        self.wanted.set()
+        return puzzle
+
+    '''
+    Stops the background thread - any puzzle it is in the middle of making is thrown away
+
+    Parameters:
+    timeout is the most seconds to wait for the thread to finish
+
+    Return: None
+    '''
+
+    def close(self, timeout=2.0):
+        self.stopped = True
+        self.wanted.set()
+        if self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join(timeout)
@@ -0,0 +1,305 @@
+import threading
+
+"""
+Dancing Links (Algorithm X) exact-cover solver for sudoku boards
+Based on Donald Knuth's paper "Dancing Links"
+https://arxiv.org/abs/cs/0011047
+
+Boards are the same 2D lists of ints that SudokuGenerator.get_board() returns, with 0 for an empty cell
+
+"""
+
+
+class DLXSolver:
+    '''
+    Builds the exact-cover matrix for one board size and solves boards against it
+    The links are stored in flat lists (left, right, up, down, column) instead of node objects
+    The matrix is built once in __init__ - every solve covers the clue rows, searches,
+    and then uncovers everything again, so the same solver can be reused for any number of boards
+
+    Parameters:
+    row_length is the number of rows/columns of the board (9, 16, 25 ...)
+
+    Return:
+    None
+    '''
+
+    def __init__(self, row_length=9):
+        self.row_length = row_length
+        self.box_length = int(row_length ** 0.5)
+        if self.box_length * self.box_length != row_length:
+            raise ValueError(f"row_length must be a perfect square, got {row_length}")
+        n = row_length
+        cells = n * n
+        num_cols = 4 * cells
+
+        # node 0 is the root, nodes 1..num_cols are the column headers
+        self.left = [num_cols] + list(range(num_cols))
+        self.right = list(range(1, num_cols + 1)) + [0]
+        self.up = list(range(num_cols + 1))
+        self.down = list(range(num_cols + 1))
+        self.column = list(range(num_cols + 1))
+        self.size = [0] * (num_cols + 1)
+        self.row_id = [-1] * (num_cols + 1)
+        self.row_first = []  # first node of every matrix row, indexed by (row * n + col) * n + digit - 1
+
+        for row in range(n):
+            for col in range(n):
+                box = (row // self.box_length) * self.box_length + col // self.box_length
+                for digit in range(n):
+                    matrix_row = (row * n + col) * n + digit
+                    headers = (
+                        1 + row * n + col,  # the cell is filled
+                        1 + cells + row * n + digit,  # the row has the digit
+                        1 + 2 * cells + col * n + digit,  # the column has the digit
+                        1 + 3 * cells + box * n + digit,  # the box has the digit
+                    )
+                    first = len(self.column)
+                    self.row_first.append(first)
+                    for k, header in enumerate(headers):
+                        node = first + k
+                        self.column.append(header)
+                        self.row_id.append(matrix_row)
+                        # link into the bottom of the column
+                        self.up.append(self.up[header])
+                        self.down.append(header)
+                        self.down[self.up[header]] = node
+                        self.up[header] = node
+                        self.size[header] += 1
+                        # link into the row (circular, four nodes)
+                        self.left.append(first + (k - 1) % 4)
+                        self.right.append(first + (k + 1) % 4)
+
+    '''
+    Removes column c from the header list and removes every row that uses it from the other columns
+
+    Parameters:
+    c is the column header node
+
+    Return: None
+    '''
+
+    def cover(self, c):
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        right[left[c]] = right[c]
+        left[right[c]] = left[c]
+        i = down[c]
+        while i != c:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    '''
+    Undoes cover(c) - must be called in the reverse order of the covers
+
+    Parameters:
+    c is the column header node
+
+    Return: None
+    '''
+
+    def uncover(self, c):
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        i = up[c]
+        while i != c:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[c]] = c
+        left[right[c]] = c
+
+    '''
+    Runs Algorithm X on the given board and calls on_solution with every solution found
+    Clue rows are covered first and always uncovered at the end, so the matrix is back to
+    its starting state when this returns, even if the search stopped early
+
+    Parameters:
+    board is a 2D list of ints (0 for empty)
+    on_solution is called with the solved board, and should return True to stop the search
+
+    Return: None
+    '''
+
+    def search(self, board, on_solution):
+        n = self.row_length
+        if len(board) != n or any(len(board_row) != n for board_row in board):
+            raise ValueError(f"board must be {n}x{n}")
+
+        right, down, column, size = self.right, self.down, self.column, self.size
+        covered = []  # column headers covered by the clues, in order
+        clue_rows = []
+        try:
+            for row in range(n):
+                for col in range(n):
+                    value = board[row][col]
+                    if value == 0:
+                        continue
+                    if not 1 <= value <= n:
+                        raise ValueError(f"invalid value {value} at ({row}, {col})")
+                    node = self.row_first[(row * n + col) * n + value - 1]
+                    for k in range(4):
+                        c = column[node + k]
+                        if right[self.left[c]] != c:
+                            return  # this column is already taken by another clue, so no solutions
+                        self.cover(c)
+                        covered.append(c)
+                    clue_rows.append(node)
+
+            chosen = []
+
+            def solve():
+                if right[0] == 0:
+                    return on_solution(self.to_board(clue_rows + chosen))
+                # choose the column with the fewest rows left (Knuth's S heuristic)
+                c = right[0]
+                best = size[c]
+                j = right[c]
+                while j != 0 and best > 1:
+                    if size[j] < best:
+                        c = j
+                        best = size[j]
+                    j = right[j]
+                if best == 0:
+                    return False
+                self.cover(c)
+                stop = False
+                r = down[c]
+                while r != c and not stop:
+                    chosen.append(r)
+                    j = right[r]
+                    while j != r:
+                        self.cover(column[j])
+                        j = right[j]
+                    stop = solve()
+                    j = self.left[r]
+                    while j != r:
+                        self.uncover(column[j])
+                        j = self.left[j]
+                    chosen.pop()
+                    r = down[r]
+                self.uncover(c)
+                return stop
+
+            solve()
+        finally:
+            for c in reversed(covered):
+                self.uncover(c)
+
+    '''
+    Turns a list of chosen matrix nodes into a 2D board
+
+    Parameters:
+    nodes is a list of nodes, one from each chosen matrix row
+
+    Return: list[list]
+    '''
+
+    def to_board(self, nodes):
+        n = self.row_length
+        board = [[0] * n for i in range(n)]
+        for node in nodes:
+            matrix_row = self.row_id[node]
+            cell, digit = divmod(matrix_row, n)
+            board[cell // n][cell % n] = digit + 1
+        return board
+
+    '''
+    Returns the first solution found for the board, or None if it can't be solved
+
+    Parameters:
+    board is a 2D list of ints (0 for empty)
+
+    Return: list[list] or None
+    '''
+
+    def solve(self, board):
+        found = []
+
+        def keep_first(solution):
+            found.append(solution)
+            return True
+
+        self.search(board, keep_first)
+        return found[0] if found else None
+
+    '''
+    Returns every solution for the board, stopping after limit solutions if limit is given
+
+    Parameters:
+    board is a 2D list of ints (0 for empty)
+    limit is the most solutions to return (None for no limit)
+
+    Return: list[list[list]]
+    '''
+
+    def solve_all(self, board, limit=None):
+        found = []
+
+        def keep(solution):
+            found.append(solution)
+            return limit is not None and len(found) >= limit
+
+        self.search(board, keep)
+        return found
+
+    '''
+    Counts the solutions of the board, stopping early once limit is reached
+    count_solutions(board, 2) == 1 is the usual check for a unique puzzle
+
+    Parameters:
+    board is a 2D list of ints (0 for empty)
+    limit is the count to stop at (None for no limit)
+
+    Return: int
+    '''
+
+    def count_solutions(self, board, limit=None):
+        count = 0
+
+        def tally(solution):
+            nonlocal count
+            count += 1
+            return limit is not None and count >= limit
+
+        self.search(board, tally)
+        return count
+
+
+_local = threading.local()  # a solver is changed while it searches, so each thread gets its own
+
+'''
+Returns this thread's DLXSolver for a board size, building it the first time it is asked for
+
+Parameters:
+row_length is the number of rows/columns of the board
+
+Return: DLXSolver
+'''
+
+
+def get_solver(row_length=9):
+    solvers = _local.__dict__.setdefault("solvers", {})
+    solver = solvers.get(row_length)
+    if solver is None:
+        solver = solvers[row_length] = DLXSolver(row_length)
+    return solver
+
+
+def solve(board):
+    return get_solver(len(board)).solve(board)
+
+
+def solve_all(board, limit=None):
+    return get_solver(len(board)).solve_all(board, limit)
+
+
+def count_solutions(board, limit=None):
+    return get_solver(len(board)).count_solutions(board, limit)
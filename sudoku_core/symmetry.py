@@ -0,0 +1,328 @@
+import itertools
+import operator
+import random
+
+from sudoku_core.generator import SudokuGenerator
+
+"""
+Symmetry transforms - ways of shuffling a sudoku that always give another valid sudoku with the
+same number of solutions and the same difficulty:
+    relabeling the digits
+    reordering the rows inside a band (a row of boxes), and the bands themselves
+    reordering the columns inside a stack (a column of boxes), and the stacks themselves
+    transposing the board
+A 9x9 grid has 9! * 1296 * 1296 * 2 (about 1.2 trillion) of these, so one generated puzzle can be
+turned into many new-looking ones without generating again
+
+Boards are handled as flat bytes (one byte per cell, 0 for empty). Each Transform works out its
+cell permutation once, after that applying it is an itemgetter and a bytes.translate
+
+"""
+
+_line_permutations = {}
+
+'''
+Returns every order of the rows (or columns) that keeps each band together - the band order
+and the order inside each band. Built once per size
+
+Parameters:
+row_length is the number of rows/columns of the board
+
+Return: tuple of tuples (each one lists the old line for every new line)
+'''
+
+
+def line_permutations(row_length):
+    perms = _line_permutations.get(row_length)
+    if perms is None:
+        box = int(row_length ** 0.5)
+        perms = []
+        for band_order in itertools.permutations(range(box)):
+            for inner in itertools.product(itertools.permutations(range(box)), repeat=box):
+                perms.append(tuple(band * box + line for band, order in zip(band_order, inner) for line in order))
+        perms = _line_permutations[row_length] = tuple(perms)
+    return perms
+
+
+'''
+Picks a random order of the rows (or columns) that keeps each band together
+
+Parameters:
+row_length is the number of rows/columns of the board
+rng is the random.Random (or module) to draw from
+
+Return: list (the old line for every new line)
+'''
+
+
+def random_line_permutation(row_length, rng=random):
+    box = int(row_length ** 0.5)
+    bands = list(range(box))
+    rng.shuffle(bands)
+    lines = []
+    for band in bands:
+        inner = list(range(band * box, band * box + box))
+        rng.shuffle(inner)
+        lines.extend(inner)
+    return lines
+
+
+def to_bytes(board):
+    return bytes(value for board_row in board for value in board_row)
+
+
+def from_bytes(data, row_length):
+    return [list(data[start:start + row_length]) for start in range(0, row_length * row_length, row_length)]
+
+
+class Transform:
+    '''
+    Precomputes the cell permutation and digit table for one transform
+
+    Parameters:
+    row_length is the number of rows/columns of the board
+    rows is the old row for every new row (None to keep them in place)
+    cols is the old column for every new column (None to keep them in place)
+    digits is the new digit for every old digit, with digits[0] == 0 (None to keep them)
+    transpose is True to swap rows and columns after reordering them
+
+    Return:
+    None
+    '''
+
+    def __init__(self, row_length=9, rows=None, cols=None, digits=None, transpose=False):
+        n = row_length
+        self.row_length = n
+        self.rows = tuple(rows) if rows is not None else tuple(range(n))
+        self.cols = tuple(cols) if cols is not None else tuple(range(n))
+        self.digits = tuple(digits) if digits is not None else tuple(range(n + 1))
+        self.transpose = transpose
+        # cells[i] is the old flat index of the cell that ends up at flat index i
+        if transpose:
+            self.cells = tuple(self.rows[col] * n + self.cols[row] for row in range(n) for col in range(n))
+        else:
+            self.cells = tuple(self.rows[row] * n + self.cols[col] for row in range(n) for col in range(n))
+        self.pick = operator.itemgetter(*self.cells)
+        self.table = bytes(self.digits) + bytes(range(n + 1, 256))
+
+    '''
+    Applies the transform to a flat board
+
+    Parameters:
+    data is the board as bytes, one byte per cell (0 for empty)
+
+    Return: bytes
+    '''
+
+    def apply_bytes(self, data):
+        return bytes(self.pick(data)).translate(self.table)
+
+    '''
+    Applies the transform to a 2D board - empty cells move with the rest, so this works on a
+    puzzle (its blank mask is carried along) as well as on a solution
+
+    Parameters:
+    board is a 2D list (0 for empty)
+
+    Return: list[list]
+    '''
+
+    def apply(self, board):
+        return from_bytes(self.apply_bytes(to_bytes(board)), self.row_length)
+
+    '''
+    Builds the transformed copy of a whole puzzle - the board and its solution go through the
+    same transform, so the copy is solved by the transformed solution
+
+    Parameters:
+    sudoku is a SudokuGenerator
+
+    Return: SudokuGenerator
+    '''
+
+    def apply_sudoku(self, sudoku):
+        derived = SudokuGenerator.from_boards(self.apply(sudoku.board_original), self.apply(sudoku.board_correct))
+        derived.unique = sudoku.unique
+        return derived
+
+
+'''
+Picks a random transform
+
+Parameters:
+row_length is the number of rows/columns of the board
+rng is the random.Random (or module) to draw from
+
+Return: Transform
+'''
+
+
+def random_transform(row_length=9, rng=random):
+    digits = list(range(1, row_length + 1))
+    rng.shuffle(digits)
+    return Transform(row_length, random_line_permutation(row_length, rng), random_line_permutation(row_length, rng),
+                     [0] + digits, rng.random() < 0.5)
+
+
+'''
+Yields every transform that moves cells around (transpose, row order, column order), all with
+the same digit relabeling
+A 9x9 board has 3,359,232 of these, so this is for small boards or for stopping early
+
+Parameters:
+row_length is the number of rows/columns of the board
+digits is the digit relabeling to use with each one (None to keep the digits)
+
+Return: generator of Transform
+'''
+
+
+def iter_transforms(row_length=9, digits=None):
+    perms = line_permutations(row_length)
+    for transpose in (False, True):
+        for rows in perms:
+            for cols in perms:
+                yield Transform(row_length, rows, cols, digits, transpose)
+
+
+'''
+Builds new puzzles from one by applying random transforms to it
+Each one has the same clue count, number of solutions and difficulty as the original
+
+Parameters:
+sudoku is the SudokuGenerator to start from
+count is how many puzzles to make
+rng is the random.Random (or module) to draw from
+
+Return: generator of SudokuGenerator
+'''
+
+
+def derive(sudoku, count, rng=random):
+    for i in range(count):
+        yield random_transform(sudoku.row_length, rng).apply_sudoku(sudoku)
+
+
+'''
+Relabels the digits in a row in order of first appearance, carrying on from the rows before it
+
+Parameters:
+values is the row's digits
+mapping is the new label for each old digit so far (0 for not labeled yet) - it is changed in place
+labeled is how many digits have a label so far
+
+Return: tuple (relabeled row as a tuple, new labeled count)
+'''
+
+
+def _relabel(values, mapping, labeled):
+    row = []
+    for value in values:
+        if value:
+            if not mapping[value]:
+                labeled += 1
+                mapping[value] = labeled
+            value = mapping[value]
+        row.append(value)
+    return tuple(row), labeled
+
+
+'''
+Describes what a partly built canonical form still has to choose from - the unused rows as they
+will come out (columns in the state's order, labeled digits as their labels, unlabeled ones as
+their negatives), grouped the way they can still be picked. Two states with the same key finish
+the same way, so only one of them needs to be carried on
+
+Parameters:
+grid, used, cols, mapping and labeled are a state in canonical_form
+box is the box length
+
+Return: tuple
+'''
+
+
+def _state_key(grid, used, cols, mapping, labeled, box):
+    n = len(grid)
+    pick = operator.itemgetter(*cols)
+    translate = [label or -value for value, label in enumerate(mapping)].__getitem__
+    lines = [None if row in used else tuple(map(translate, pick(grid[row]))) for row in range(n)]
+    current = ()
+    if len(used) % box:
+        band = used[-1] // box
+        current = tuple(sorted(line for line in lines[band * box:band * box + box] if line is not None))
+    used_bands = {row // box for row in used}
+    bands = tuple(sorted(tuple(sorted(lines[band * box:band * box + box]))
+                         for band in range(n // box) if band not in used_bands))
+    return labeled, current, bands
+
+
+'''
+Returns the canonical form of a board - the same bytes for every board that one of the
+transforms turns into every other, so it can be used as a key to throw away duplicate puzzles
+It is the smallest board (comparing cells in reading order) that any transform can produce.
+The board is built one row at a time and only the choices that tie for the smallest rows so
+far are carried on, instead of trying all 3.4 million cell orders. Tied choices that are bound
+to finish the same way are merged (see _state_key) - without that an empty board ties on every
+order, row after row. So no step carries more than the 2 * 9 * 1296 = 23328 first-row choices:
+normal puzzles take 30-100 ms, and the worst boards tried (an empty board, a few clues, a
+single full row) stay under a second
+
+Parameters:
+board is a 2D list (0 for empty) of at most 9x9 - bigger sizes have too many line orders
+
+Return: bytes
+'''
+
+
+def canonical_form(board):
+    n = len(board)
+    if n > 9:
+        raise ValueError(f"canonical forms are for boards up to 9x9, got {n}x{n}")
+    box = int(n ** 0.5)
+    grids = (board, [list(col) for col in zip(*board)])
+
+    # each state is (grid, rows used so far, column order, digit labels, labeled count)
+    best = None
+    states = {}
+    for index, grid in enumerate(grids):
+        columns = list(zip(*grid))
+        for first in range(n):
+            values = grid[first]
+            for cols in line_permutations(n):
+                mapping = [0] * (n + 1)
+                row, labeled = _relabel([values[col] for col in cols], mapping, 0)
+                if best is None or row < best:
+                    best = row
+                    states = {}
+                if row == best:
+                    # column orders that only swap identical columns give the same state
+                    key = (index, first, operator.itemgetter(*cols)(columns))
+                    states.setdefault(key, (grid, (first,), cols, mapping, labeled))
+    states = list(states.values())
+    form = list(best)
+
+    for position in range(1, n):
+        best = None
+        next_states = []
+        for grid, used, cols, mapping, labeled in states:
+            if position % box == 0:  # starting a new band, any row of an unused band can go here
+                used_bands = {row // box for row in used}
+                choices = [row for row in range(n) if row // box not in used_bands]
+            else:
+                band = used[position - position % box] // box
+                choices = [row for row in range(band * box, band * box + box) if row not in used]
+            for choice in choices:
+                values = grid[choice]
+                new_mapping = mapping[:]
+                row, new_labeled = _relabel([values[col] for col in cols], new_mapping, labeled)
+                if best is None or row < best:
+                    best = row
+                    next_states = []
+                if row == best:
+                    next_states.append((grid, used + (choice,), cols, new_mapping, new_labeled))
+        merged = {}
+        for state in next_states:
+            merged.setdefault(_state_key(*state, box), state)
+        states = list(merged.values())
+        form.extend(best)
+    return bytes(form)
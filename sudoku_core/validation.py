@@ -0,0 +1,27 @@
+"""
+Checks on a player's board that don't need the game window
+
+"""
+
+
+def user_input_valid(input_pos,sudoku_instance):
+    #input_pos should be iteratable with index 0 being an x cord and index 1 being y cord
+    #sudoku_instance will always be "sudoku" (not a string tho) because that's the var we called it
+    if sudoku_instance.board_original[input_pos[0]][input_pos[1]] == 0:
+        return True
+    return False
+
+def check_win(board, sudoku_instance):
+    if board == sudoku_instance.board_correct:
+        return True
+    else:
+        return False
+
+def check_full(board):
+    # Iterate through the board and check if there's any empty cell (value = 0)
+    for row in range(9):
+        for col in range(9):
+            if board[row][col] == 0:
+                return False  # Found an empty cell, return False
+    return True  # All cells are filled
+
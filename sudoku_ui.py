@@ -0,0 +1,722 @@
+import pygame
+import sys
+import time
+
+from sudoku_core import game_logic, grader, journal, profiling, puzzle_pool
+from sudoku_core.game_logic import LOST, MENU, PLAYING, WON
+from sudoku_core.generator import new_sudoku
+
+from pygame.event import set_keyboard_grab
+
+"""
+The game window - drawing the board, the menus and handling the keyboard and mouse
+This is the only module that imports pygame - everything about the puzzle itself is in sudoku_core
+
+"""
+
+POOL_DEPTH = 2  # ready puzzles kept for each difficulty
+MAX_FPS = 60  # cap on redraws per second when input is coming in fast
+NAV_WRAP = False  # arrow keys wrap around to the other side of the board
+AUTO_NOTES = False  # rub a committed number out of the sketches in its row, column and box (N toggles it)
+JOURNAL_PATH = "session.journal"  # the game in progress is saved here as it is played, and picked up again on the next start
+TROUBLE_PROFILE = True  # troubleshooting prints a profile of the hot functions instead of whole boards
+# drawing functions profiled along with profiling.HOOKS while troubleshooting
+UI_HOOKS = tuple(f"{__name__}:{name}" for name in ("draw_numbers", "draw_cell", "BoardRenderer.draw", "Game.check_board"))
+
+
+CELL_SIZE = 94
+BOARD_BG = "light blue"
+# (font size, colour) for each kind of digit drawn on the board
+GLYPH_STYLES = {"given": (60, (0, 0, 0)), "player": (60, (80, 80, 80)), "sketch": (30, (100, 100, 100)),
+                "conflict": (60, (200, 0, 0))}
+_fonts = {}
+_glyphs = {}
+_grid_surface = None
+
+'''
+Returns the pre-rendered surface for a digit, rendering it the first time it is asked for
+Fonts and glyphs are only made once, instead of every frame
+
+Parameters:
+digit is the number to draw
+style is "given", "player", "sketch" or "conflict" (see GLYPH_STYLES)
+
+Return: pygame.Surface
+'''
+
+
+def get_glyph(digit, style):
+    glyph = _glyphs.get((digit, style))
+    if glyph is None:
+        size, color = GLYPH_STYLES[style]
+        font = _fonts.get(size)
+        if font is None:
+            font = _fonts[size] = pygame.font.Font(None, size)
+        glyph = _glyphs[(digit, style)] = font.render(str(digit), True, color)
+    return glyph
+
+
+'''
+Returns a see-through surface with the grid lines on it, drawn the first time it is asked for
+
+Parameters: None
+Return: pygame.Surface
+'''
+
+
+def get_grid_surface():
+    global _grid_surface
+    if _grid_surface is None:
+        size = 9 * CELL_SIZE + 2  # room for the thick outer line
+        _grid_surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        for i in range(10):  # 10 lines to make a 9x9 grid
+            if i == 0: # Thicker lines for box boundaries
+                width = 1
+            elif i % 3 == 0:
+                width = 3
+            else:
+                width = 1
+            pygame.draw.line(_grid_surface, (0, 0, 0), (i * CELL_SIZE, 0), (i * CELL_SIZE, 9 * CELL_SIZE), width)  # Vertical lines
+            pygame.draw.line(_grid_surface, (0, 0, 0), (0, i * CELL_SIZE), (9 * CELL_SIZE, i * CELL_SIZE), width)  # Horizontal lines
+    return _grid_surface
+
+
+def draw_grid(screen):
+    screen.blit(get_grid_surface(), (0, 0))
+
+
+'''
+Draws the contents of one cell - the number or the sketches, and the red outline if it is selected
+
+Parameters:
+screen is the surface to draw on
+row and col are the cell to draw
+value is the number in the cell (0 for empty)
+given is True if the number was part of the original puzzle
+sketches is the bitmask of sketched numbers (bit n set when n is sketched)
+selected is True if the cell is the selected one
+conflict is True if the number is repeated in its row, column or box (drawn in red)
+
+Return: None
+'''
+
+
+def draw_cell(screen, row, col, value, given, sketches, selected, conflict=False):
+    x = col * CELL_SIZE
+    y = row * CELL_SIZE
+    if given:  # Permanent numbers
+        screen.blit(get_glyph(value, "given"), (x + 35, y + 25))
+    elif value != 0:  # User-input numbers
+        screen.blit(get_glyph(value, "conflict" if conflict else "player"), (x + 35, y + 25))
+    else:  # Sketched values
+        while sketches:
+            bit = sketches & -sketches
+            sketches ^= bit
+            sketch = bit.bit_length() - 1
+            x_offset = x + 10 + ((sketch - 1) % 3) * 30  # each number has its own spot, like a phone keypad
+            y_offset = y + 10 + ((sketch - 1) // 3) * 30
+            screen.blit(get_glyph(sketch, "sketch"), (x_offset, y_offset))
+
+    # Highlight the selected cell
+    if selected:
+        pygame.draw.rect(screen, (255, 0, 0), pygame.Rect(x, y, CELL_SIZE, CELL_SIZE), 3)
+
+
+# Function to place numbers on the board
+def draw_numbers(screen, board, selected_cord, sudoku_instance, sketched_values):
+    for row in range(9):
+        for col in range(9):
+            draw_cell(screen, row, col, board[row][col], sudoku_instance.board_original[row][col] != 0,
+                      sketched_values.mask(row, col), selected_cord is not None and [row, col] == selected_cord)
+
+
+class BoardRenderer:
+    '''
+    Redraws only the cells that changed since the last frame
+    The background colour, grid lines and buttons are drawn once onto a cached background surface,
+    and a changed cell is cleared by copying its square back from that surface
+
+    Parameters:
+    screen is the display surface
+    overlays is a list of (surface, rect) pairs that never change, like the buttons
+
+    Return:
+    None
+    '''
+
+    def __init__(self, screen, overlays=()):
+        self.screen = screen
+        self.background = pygame.Surface(screen.get_size())
+        self.background.fill(BOARD_BG)
+        draw_grid(self.background)
+        for surface, rect in overlays:
+            self.background.blit(surface, rect)
+        self.last = None  # what each cell looked like when it was last drawn
+
+    '''
+    Forces the next draw() to repaint the whole screen
+
+    Parameters: None
+    Return: None
+    '''
+
+    def invalidate(self):
+        self.last = None
+
+    '''
+    Draws every cell whose value, sketches, selection or conflict state changed
+
+    Parameters:
+    board, selected_cord, sudoku_instance and sketched_values are the same as for draw_numbers
+    model is the BoardModel used to highlight conflicting numbers (None for no highlighting)
+
+    Return: list of pygame.Rect (the areas to pass to pygame.display.update)
+    '''
+
+    def draw(self, board, selected_cord, sudoku_instance, sketched_values, model=None):
+        full = self.last is None
+        if full:
+            self.screen.blit(self.background, (0, 0))
+            self.last = [None] * 81
+        dirty = []
+        for row in range(9):
+            for col in range(9):
+                given = sudoku_instance.board_original[row][col] != 0
+                selected = selected_cord is not None and [row, col] == selected_cord
+                conflict = model is not None and not given and model.is_conflict(row, col)
+                state = (board[row][col], given, sketched_values.mask(row, col), selected, conflict)
+                if state == self.last[row * 9 + col]:
+                    continue
+                self.last[row * 9 + col] = state
+                rect = pygame.Rect(col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+                if not full:
+                    self.screen.blit(self.background, rect, rect)
+                draw_cell(self.screen, row, col, *state)
+                dirty.append(rect)
+        if full:
+            return [self.screen.get_rect()]
+        return dirty
+
+
+def troubleshooter(sudoku = None,board=None,sketched_values=None,selected_cord=None):
+    if board != None:
+        print("board:")
+        for row in board:
+            print(row)
+
+    if sketched_values != None:
+        print(f"\nsketches:")
+        for row in sketched_values:
+            print (row)
+    if selected_cord != None:
+        print(f"Selcted cord: {selected_cord}",end = "=")
+        print(board[selected_cord[0]][selected_cord[1]])
+    if sudoku != None:
+        print("\nSudoku Class:\nCorrect Answers")
+        for row in sudoku.board_correct:
+            print (row)
+        print(f"Missing terms now")
+        board_test = [[0 for i in range(9)] for i in range(9)]
+        for i in range(9):
+            row = sudoku.board_original[i]
+            for j in range(9):
+                correct_term = sudoku.board_correct[i][j]
+                if board != None:
+                    if correct_term != board[i][j] and board[i][j] != 0:
+                        print(f"Position: {i},{j} is wrong, it shouldn't be {board[i][j]} and should be {correct_term}")
+                        board_test[i][j] = sudoku.board_correct[i][j]
+                if row[j] == 0 and board[i][j] != correct_term:
+                    board_test[i][j] = sudoku.board_correct[i][j]
+        for row in board_test:
+            print(row)
+
+#class function to input users input into a singular cell
+# class Cell:
+#     def __init__ (self, value, row, col, screen):
+#         self.value = value
+#         self.row = row
+#         self.col = col
+#         self.screen = screen
+#         self.sketched = 0
+#         self.selected = False
+#         self.width = 94
+#         self.height = 94
+#         self.x = col * self.width
+#         self.y = row * self.height
+#
+#     def set_cell_value(self, value):
+#         self.value = value
+#
+#     def set_sketched_value(self, value):
+#         self.sketched = value
+#
+#     def draw(self):
+#         rect = pygame.Rect(self.x, self.y, self.width, self.height)
+#         pygame.draw.rect(self.screen, (255, 0, 0) if self.selected else (0, 0, 0), rect, 3 if self.selected else 1)
+#         font = pygame.font.Font(None, 60)
+#         if self.value != 0:
+#             number = font.render(str(self.value), True, (0, 0, 0))
+#             self.screen.blit(number, (self.x + 35, self.y + 25))  # Center numbers
+#         elif self.sketched != 0:
+#             sketched_number = font.render(str(self.sketched), True, (100, 100, 100))
+#             self.screen.blit(sketched_number, (self.x + 10, self.y + 10))  # Top-left alignment for sketched numbers
+
+
+class FrameStats:
+    '''
+    Counts how often the game loop wakes up and redraws, and how much CPU the UI thread spends
+    Uses time.thread_time so the background puzzle pool's work isn't counted against the UI
+
+    Parameters: None
+
+    Return:
+    None
+    '''
+
+    def __init__(self):
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.thread_time()
+        self.wakeups = 0
+        self.frames = 0
+        self.frame_cpu = 0.0
+        self.frame_start = 0.0
+
+    def begin_frame(self):
+        self.wakeups += 1
+        self.frame_start = time.thread_time()
+
+    '''
+    Ends a loop iteration started with begin_frame
+
+    Parameters:
+    drew is True if the iteration redrew the screen
+
+    Return: None
+    '''
+
+    def end_frame(self, drew):
+        if drew:
+            self.frames += 1
+            self.frame_cpu += time.thread_time() - self.frame_start
+
+    '''
+    Sums up the stats so far as one line
+
+    Parameters: None
+    Return: str
+    '''
+
+    def report(self):
+        wall = time.perf_counter() - self.start_wall
+        cpu = time.thread_time() - self.start_cpu
+        per_frame = self.frame_cpu / self.frames * 1000 if self.frames else 0.0
+        return (f"{wall:.1f}s: {self.wakeups} wakeups, {self.frames} frames ({self.frames / wall:.1f} fps), "
+                f"{per_frame:.2f} ms CPU per frame, UI thread at {cpu / wall:.1%} CPU")
+
+
+'''
+Blocks until at least one event arrives, then returns it along with anything else already queued
+This is what lets an idle game use no CPU instead of spinning on pygame.event.get()
+
+Parameters: None
+Return: list of pygame events
+'''
+
+
+def wait_for_events():
+    events = [pygame.event.wait()]
+    events.extend(pygame.event.get())
+    return events
+
+
+'''
+Shuts everything down and exits, printing the frame stats first when troubleshooting
+
+Parameters:
+pool is the PuzzlePool to stop
+stats is the FrameStats for the game (None if the game hasn't started)
+trouble_mode is True to print the stats
+
+Return: None (never returns)
+'''
+
+
+def quit_game(pool, stats=None, trouble_mode=False):
+    pool.close()
+    if trouble_mode and stats is not None:
+        print(stats.report())
+    pygame.quit()
+    sys.exit()
+
+
+class Assets:
+    '''
+    Loads and scales the background images and renders the button text
+    Only ever made once per run (see get_assets), so going back to the menu doesn't reload anything
+
+    Parameters:
+    None
+
+    Return:
+    None
+    '''
+
+    def __init__(self):
+        self.menu_bg = pygame.image.load('menu_bg2.png')
+        self.menu_bg = pygame.transform.scale(self.menu_bg, (900, 900))
+
+        font1 = pygame.font.SysFont('Arial', 61)
+        self.easy_text = font1.render("Easy", True, (255, 255, 255), (250, 140, 0))
+        self.medium_text = font1.render("Medium", True, (255,255,255), (250, 140, 0))
+        self.hard_text = font1.render("Hard", True, (255,255,255), (250, 140, 0))
+        self.easy_rect = self.easy_text.get_rect(center = (120, 535))
+        self.medium_rect = self.medium_text.get_rect(center=(427, 535))
+        self.hard_rect = self.hard_text.get_rect(center=(730, 535))
+
+        #((580, 379), (25, 25))
+        #trouble_text = font1.render("Troubleshoot", True, (255, 255, 255), (250, 140, 0))
+        self.trouble_rect = self.easy_rect.copy()
+        self.trouble_rect = self.trouble_rect.move(460,-136)
+
+        font2 = pygame.font.SysFont('Arial', 41)
+        self.bg_image = pygame.image.load('game_bg.png')
+        self.bg_image = pygame.transform.scale(self.bg_image, (900, 940))
+        self.reset_text = font2.render("Reset", True, (255, 255, 255), (250, 140, 0))
+        self.restart_text_main = font2.render("Restart", True, (255, 255, 255), (250, 140, 0))
+        self.exit_text = font2.render("Exit", True, (255, 255, 255), (250, 140, 0))
+        self.reset_rect = self.reset_text.get_rect(center = (185, 872))
+        self.restart_rect_main = self.restart_text_main.get_rect(center = (455, 872))
+        self.exit_rect = self.exit_text.get_rect(center = (720, 872))
+
+        self.bg_image_game_over = pygame.image.load('game_over5.png')
+        self.bg_image_game_over = pygame.transform.scale(self.bg_image_game_over, (900, 900))
+        self.bg_image_game_won = pygame.image.load('game_won5.png')
+        self.bg_image_game_won = pygame.transform.scale(self.bg_image_game_won, (900, 900))
+
+        restart_font = pygame.font.SysFont('Arial', 61)
+        self.restart_text = restart_font.render("Restart", True, (255, 255, 255), (250, 140, 0))  # "Restart" text
+        self.restart_rect = self.restart_text.get_rect(center=(440, 480))  # Position the restart button
+        self.exit_text_won = restart_font.render("Exit", True, (255, 255, 255), (250, 140, 0))
+        self.exit_rect_won = self.exit_text.get_rect(center = (440, 480))
+
+
+_assets = None
+
+
+def get_assets():
+    global _assets
+    if _assets is None:
+        _assets = Assets()
+    return _assets
+
+
+# the direction GameLogic.move takes for each arrow key
+ARROW_KEYS = {pygame.K_UP: "up", pygame.K_DOWN: "down", pygame.K_LEFT: "left", pygame.K_RIGHT: "right"}
+
+
+class Game:
+    '''
+    The whole game as a state machine - one scene at a time (MENU, PLAYING, WON or LOST), with
+    one event loop in run() that hands each event to the current scene
+    Restarting just switches back to MENU, so nothing is reloaded and the stack never grows
+
+    Parameters:
+    pool is the PuzzlePool the difficulty buttons take puzzles from
+
+    Return:
+    None
+    '''
+
+    def __init__(self, pool):
+        start = time.perf_counter()
+        self.pool = pool
+        pygame.init()
+        self.screen = pygame.display.set_mode((846, 900))
+        pygame.display.set_caption("Sudoku")
+        self.assets = get_assets()
+        self.renderer = BoardRenderer(self.screen, [(self.assets.reset_text, self.assets.reset_rect),
+                                                    (self.assets.restart_text_main, self.assets.restart_rect_main),
+                                                    (self.assets.exit_text, self.assets.exit_rect)])
+        self.trouble_mode = False
+        self.auto_notes = AUTO_NOTES
+        self.clock = pygame.time.Clock()
+        self.stats = FrameStats()
+        self.latency = {"startup": 0.0, "new game": [], "restart": []}  # seconds, for troubleshooting
+
+        self.logic = None  # the GameLogic of the game being played - everything on the board goes through it
+        self.sudoku = None
+        self.model = None
+        self.board = None
+        self.sketched_values = None
+        self.redraw = False  # only redraw after something that could change what's on screen
+
+        logic = journal.resume(JOURNAL_PATH)
+        if logic is not None and logic.scene == PLAYING:
+            self.play(logic)
+        else:
+            if logic is not None:
+                logic.trace.close()
+            journal.discard(JOURNAL_PATH)
+            self.enter_menu()
+        self.latency["startup"] = time.perf_counter() - start
+
+    '''
+    Paints the current scene from scratch (the board is repainted by the renderer)
+
+    Parameters: None
+    Return: None
+    '''
+
+    def draw_scene(self):
+        assets = self.assets
+        if self.scene == MENU:
+            self.screen.blit(assets.menu_bg, (0, 0))
+            self.screen.blit(assets.easy_text, assets.easy_rect)
+            self.screen.blit(assets.medium_text, assets.medium_rect)
+            self.screen.blit(assets.hard_text, assets.hard_rect)
+            pygame.display.update()
+        elif self.scene == WON:
+            self.screen.fill((255, 255, 255))
+            self.screen.blit(assets.bg_image_game_won, (0, 0))
+            self.screen.blit(assets.exit_text_won, assets.exit_rect_won)
+            pygame.display.update()
+        elif self.scene == LOST:
+            self.screen.fill((255, 255, 255))
+            self.screen.blit(assets.bg_image_game_over, (0, 0))
+            self.screen.blit(assets.restart_text, assets.restart_rect)
+            pygame.display.update()
+        else:
+            self.renderer.invalidate()
+            self.redraw = True
+
+    def enter_menu(self):
+        self.scene = MENU
+        self.draw_scene()
+
+    def restart(self):
+        start = time.perf_counter()
+        self.end_journal()
+        self.enter_menu()
+        self.latency["restart"].append(time.perf_counter() - start)
+
+    '''
+    Takes a puzzle from the pool and switches to the board
+
+    Parameters:
+    level is grader.EASY, MEDIUM or HARD
+
+    Return: None
+    '''
+
+    def start_game(self, level):
+        start = time.perf_counter()
+        logic = game_logic.GameLogic(self.pool.get(level), auto_notes=self.auto_notes, wrap=NAV_WRAP)
+        journal.Journal.start(JOURNAL_PATH, logic)
+        self.play(logic)
+        self.latency["new game"].append(time.perf_counter() - start)
+
+    '''
+    Switches to the board for a game, new or resumed from the journal
+
+    Parameters:
+    logic is the GameLogic of the game
+
+    Return: None
+    '''
+
+    def play(self, logic):
+        self.logic = logic
+        self.auto_notes = logic.auto_notes
+        self.sudoku = self.logic.sudoku
+        self.model = self.logic.model
+        self.board = self.logic.board
+        # Singular cell input
+        #cells = [[Cell(board[row][col], row, col, screen) for col in range(9)] for row in range(9)]
+        #selected = None
+        self.sketched_values = self.logic.sketched_values
+        self.scene = PLAYING
+        self.renderer.invalidate()
+        pygame.display.update(self.renderer.draw(self.board, self.logic.selected_cord, self.sudoku, self.sketched_values, self.model))
+
+    '''
+    Stops journaling the current game and deletes its journal - it is finished or abandoned, so
+    there is nothing to resume
+
+    Parameters: None
+    Return: None
+    '''
+
+    def end_journal(self):
+        if self.logic is not None and self.logic.trace is not None:
+            self.logic.trace.close()
+            self.logic.trace = None
+            journal.discard(JOURNAL_PATH)
+
+    def quit(self):
+        if self.logic is not None and self.logic.trace is not None:
+            self.logic.trace.close()  # flush the last moves, the journal is kept to resume from
+        if self.trouble_mode:
+            print(self.latency_report())
+            if profiling.is_enabled():
+                print(profiling.format_report())
+        quit_game(self.pool, self.stats, self.trouble_mode)
+
+    def latency_report(self):
+        report = f"startup {self.latency['startup'] * 1000:.1f} ms"
+        for name in ("new game", "restart"):
+            times = self.latency[name]
+            if times:
+                report += f", {name} {sum(times) / len(times) * 1000:.1f} ms avg over {len(times)}"
+        return report
+
+    def handle_menu(self, event):
+        assets = self.assets
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            pos = pygame.mouse.get_pos()
+            if assets.trouble_rect.collidepoint(pos):
+                if self.trouble_mode == False:
+                    self.trouble_mode = True
+                    print("Trouble shooting on")
+                    if TROUBLE_PROFILE:
+                        profiling.reset()
+                        profiling.enable(profiling.HOOKS + UI_HOOKS)
+                elif self.trouble_mode == True:
+                    self.trouble_mode = False
+                    print("Trouble shooting off")
+                    profiling.disable()
+            if self.trouble_mode:
+                print(f"position:{pos}")
+            if assets.easy_rect.collidepoint(pos):
+                self.start_game(grader.EASY)
+            elif assets.medium_rect.collidepoint(pos):
+                self.start_game(grader.MEDIUM)
+            elif assets.hard_rect.collidepoint(pos):
+                self.start_game(grader.HARD)
+
+    '''
+    Turns a key press or click into a GameLogic event
+    Restart and Exit are handled here, since they leave the board
+
+    Parameters:
+    event is the pygame event
+
+    Return: None
+    '''
+
+    def handle_playing(self, event):
+        assets = self.assets
+        logic = self.logic
+        if event.type == pygame.KEYDOWN:
+            self.redraw = True
+            #from litzyriveroo
+            if event.key in ARROW_KEYS:
+                logic.handle(game_logic.MOVE, ARROW_KEYS[event.key])
+            elif event.key == pygame.K_TAB:  # Jump to the next empty cell
+                logic.handle(game_logic.NEXT_EMPTY)
+            elif event.key == pygame.K_z and event.mod & pygame.KMOD_CTRL:  # Ctrl+Z undoes, Ctrl+Shift+Z redoes
+                logic.handle(game_logic.REDO if event.mod & pygame.KMOD_SHIFT else game_logic.UNDO)
+            elif event.key == pygame.K_y and event.mod & pygame.KMOD_CTRL:  # Ctrl+Y redoes
+                logic.handle(game_logic.REDO)
+            elif event.key == pygame.K_h:  # Show the easiest next step
+                logic.handle(game_logic.HINT)
+                hint = logic.last_hint
+                if hint is not None:  # the board has nowhere to show text
+                    print(f"Hint: {hint.technique} - {hint.digit} goes in row {hint.row + 1}, column {hint.col + 1}")
+            elif event.key == pygame.K_n:  # Turn auto-notes on or off
+                logic.handle(game_logic.NOTES)
+                self.auto_notes = logic.auto_notes
+            elif logic.selected_cord is not None:  # Letter keys other than these are ignored
+                if event.key in range(pygame.K_1, pygame.K_9 + 1):  # Sketch the number, or rub it out if it is already sketched
+                    logic.handle(game_logic.SKETCH, event.key - pygame.K_0)  # Convert key to number
+                elif event.key == pygame.K_RETURN:  # Finalize sketched value
+                    logic.handle(game_logic.COMMIT)
+                    if self.trouble_mode:
+                        if TROUBLE_PROFILE:
+                            print(profiling.format_report())
+                        else:
+                            troubleshooter(self.sudoku, self.board, self.sketched_values, logic.selected_cord)
+                elif event.key == pygame.K_BACKSPACE:  # Remove the last sketched value
+                    logic.handle(game_logic.ERASE)
+
+        if event.type == pygame.MOUSEBUTTONDOWN:  # clicked cell turns red
+            self.redraw = True
+            pos = pygame.mouse.get_pos()
+            cols = pos[0] // 94
+            rows = pos[1] // 94
+            logic.handle(game_logic.SELECT, [rows, cols] if 0 <= rows < 9 and 0 <= cols < 9 else None)
+            if assets.restart_rect_main.collidepoint(pos):
+                self.restart()
+            elif assets.reset_rect.collidepoint(pos):
+                logic.handle(game_logic.RESET)  # one move, so Ctrl+Z brings the cleared numbers back
+            elif assets.exit_rect.collidepoint(pos):
+                self.quit()
+
+    def handle_game_over(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            pos = pygame.mouse.get_pos()
+            if self.scene == LOST and self.assets.restart_rect.collidepoint(pos):
+                self.restart()
+            elif self.scene == WON and self.assets.exit_rect_won.collidepoint(pos):
+                self.quit()
+            elif self.assets.exit_rect.collidepoint(pos):
+                self.quit()
+
+    '''
+    Switches to the WON or LOST screen once GameLogic has moved there
+
+    Parameters: None
+    Return: None
+    '''
+
+    def check_board(self):
+        if self.logic.scene != PLAYING:
+            self.end_journal()
+            self.scene = self.logic.scene
+            self.draw_scene()
+
+    '''
+    The event loop - sleeps until something happens, hands it to the current scene,
+    then redraws the board if anything on it changed
+
+    Parameters: None
+    Return: None (the loop only ends by quitting)
+    '''
+
+    def run(self):
+        while True:
+            events = wait_for_events()
+            self.stats.begin_frame()
+            for event in events:
+                if event.type == pygame.QUIT:
+                    self.quit()
+                if event.type == pygame.VIDEOEXPOSE:  # the window was uncovered, so paint everything again
+                    self.draw_scene()
+                if self.scene == MENU:
+                    self.handle_menu(event)
+                elif self.scene == PLAYING:
+                    self.handle_playing(event)
+                else:
+                    self.handle_game_over(event)
+
+            if self.scene == PLAYING:
+                self.check_board()
+
+            drew = self.scene == PLAYING and self.redraw
+            if drew:
+                self.redraw = False
+                # Redraw only the cells that changed (the grid and buttons are cached by the renderer)
+                dirty = self.renderer.draw(self.board, self.logic.selected_cord, self.sudoku, self.sketched_values, self.model) #Can highlight the selected box. Also it needs the instance name to know which is user generated and which is OG
+                if dirty:
+                    pygame.display.update(dirty)
+                self.clock.tick(MAX_FPS)
+            self.stats.end_frame(drew)
+
+
+def main(pool=None):
+    if pool is None:
+        pool = puzzle_pool.PuzzlePool(new_sudoku, (grader.EASY, grader.MEDIUM, grader.HARD),
+                                      depth=POOL_DEPTH)
+    Game(pool).run()
+
+if __name__ == "__main__":
+    main()
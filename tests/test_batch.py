@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from sudoku_core import batch
+from sudoku_core.generator import SudokuGenerator
+
+
+def test_values_above_size_are_rejected():
+    for function in (batch.validate, batch.is_valid, batch.conflict_masks, batch.propagate):
+        with pytest.raises(ValueError):
+            function([[10] * 9 for row in range(9)])
+    board = SudokuGenerator(9, 0, seed=1).get_board()
+    board[4][4] = 10
+    with pytest.raises(ValueError):
+        batch.validate(board)
+
+
+def test_validate_matches_is_valid():
+    boards = [SudokuGenerator(9, 30, seed=seed).get_board() for seed in range(20)]
+    boards[3][0][0] = boards[3][0][1] = 5  # a repeat in the first row
+    report = batch.validate(boards)
+    assert report.valid.tolist() == batch.is_valid(boards).tolist()
+    assert not report.valid[3] and report.conflicts[3][0][0] and report.conflicts[3][0][1]
+    assert np.array_equal(report.complete, batch.is_complete(boards))
@@ -0,0 +1,12 @@
+import time
+
+from sudoku_core import grader, solver
+from sudoku_core.puzzle_cache import seeded_sudoku
+
+
+def test_seeded_16x16_is_quick_and_unique():
+    start = time.perf_counter()
+    sudoku = seeded_sudoku(16, grader.MEDIUM, 1)
+    assert time.perf_counter() - start < 30
+    assert solver.count_solutions(sudoku.board_original, 2) == 1
+    assert sum(board_row.count(0) for board_row in sudoku.board_original) > 100
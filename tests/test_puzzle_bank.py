@@ -0,0 +1,37 @@
+import pytest
+
+from sudoku_core import grader
+from sudoku_core.generator import SudokuGenerator
+from sudoku_core.puzzle_bank import PuzzleBank, PuzzleBankWriter
+
+
+def write_bank(path, puzzles=3):
+    with PuzzleBankWriter(path) as writer:
+        for seed in range(puzzles):
+            sudoku = SudokuGenerator(9, 30, seed=seed)
+            writer.add(sudoku.get_board(), sudoku.board_correct, grader.EASY, seed)
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "puzzles.bank"
+    write_bank(path)
+    with PuzzleBank(path) as bank:
+        assert len(bank) == 3 and bank.count_at(grader.EASY) == 3
+        board, solution, difficulty, seed = bank[1]
+        assert board == SudokuGenerator(9, 30, seed=1).get_board() and seed == 1
+
+
+@pytest.mark.parametrize("size", [0, 10])
+def test_short_file_is_value_error(tmp_path, size):
+    path = tmp_path / "puzzles.bank"
+    path.write_bytes(b"SDKB\x01\x00\x09\x00\x00\x00"[:size])  # nothing, or the start of a real header
+    with pytest.raises(ValueError):
+        PuzzleBank(path)
+
+
+def test_truncated_bank_is_value_error(tmp_path):
+    path = tmp_path / "puzzles.bank"
+    write_bank(path)
+    path.write_bytes(path.read_bytes()[:100])
+    with pytest.raises(ValueError):
+        PuzzleBank(path)
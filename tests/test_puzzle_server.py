@@ -0,0 +1,40 @@
+import asyncio
+import json
+
+import pytest
+
+from puzzle_server import PuzzleServer
+
+
+class Writer:
+    def __init__(self):
+        self.lines = []
+
+    def is_closing(self):
+        return False
+
+    def write(self, data):
+        self.lines.append(json.loads(data))
+
+
+@pytest.fixture
+def server():
+    server = PuzzleServer(depth=1)
+    yield server
+    server.close()
+
+
+@pytest.mark.parametrize("request_args", [{"difficulty": True}, {"difficulty": False}, {"difficulty": 1.0},
+                                          {"seed": True}, {"seed": False}, {"seed": 1.5}])
+def test_generate_rejects_non_int_arguments(server, request_args):
+    writer = Writer()
+    line = json.dumps({"op": "generate", "id": 7, **request_args})
+    asyncio.run(server.respond(line, writer))
+    assert writer.lines == [{"ok": False, "error": "difficulty must be 0, 1 or 2 and seed an integer", "id": 7}]
+    assert server.errors == 1
+
+
+def test_generate_seeded(server):
+    writer = Writer()
+    asyncio.run(server.respond(json.dumps({"op": "generate", "difficulty": 1, "seed": 5}), writer))
+    assert writer.lines[0]["ok"]